@@ -6,30 +6,148 @@
 #  Copyright © 2025 CryptoTracker. All rights reserved.
 #
 
+import base64
+import cProfile
+import csv
+import gzip
+import hashlib
+import io
+import json
+import math
+import mimetypes
 import os
+import pstats
+import random
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
 from datetime import UTC, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import accumulate, count, groupby
+from operator import itemgetter
+from queue import Queue
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+import click
 import requests
-from flask import Flask, jsonify, render_template
+from flask import (
+    Flask,
+    Response,
+    abort,
+    g,
+    jsonify,
+    render_template,
+    request,
+    send_from_directory,
+    url_for,
+)
 from flask_cors import CORS
 from requests import RequestException
 
 COINGECKO_MARKETS_URL = "https://api.coingecko.com/api/v3/coins/markets"
 COINGECKO_HISTORY_URL = "https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
-TOP_LIMIT = 10
+COINCAP_ASSETS_URL = "https://rest.coincap.io/v3/assets"
+COINCAP_HISTORY_URL = "https://rest.coincap.io/v3/assets/{coin_id}/history"
+COINCAP_ICON_URL = "https://assets.coincap.io/assets/icons/{symbol}@2x.png"
+TOP_LIMIT = int(os.getenv("MARKET_TOP_LIMIT", "10"))
 HISTORY_DAYS = 7
 VS_CURRENCY = "usd"
+MARKET_FIELDS = (
+    "id",
+    "symbol",
+    "name",
+    "current_price",
+    "price_change_percentage_24h",
+    "market_cap",
+    "image",
+    "total_volume",
+)
+OPTIONAL_FIELDS = frozenset(("sparkline",))
+PROJECTABLE_FIELDS = frozenset(MARKET_FIELDS) | OPTIONAL_FIELDS
+# CoinCap slugs that differ from CoinGecko ids, which are the canonical ids.
+COINCAP_TO_COINGECKO_IDS = {
+    "avalanche": "avalanche-2",
+    "binance-coin": "binancecoin",
+    "crypto-com-coin": "crypto-com-chain",
+    "multi-collateral-dai": "dai",
+    "near-protocol": "near",
+    "polygon": "matic-network",
+    "toncoin": "the-open-network",
+    "unus-sed-leo": "leo-token",
+    "xrp": "ripple",
+}
+COINGECKO_TO_COINCAP_IDS = {value: key for key, value in COINCAP_TO_COINGECKO_IDS.items()}
+SPARKLINE_POINTS = 24
+SPARKLINE_PRECISION = 6
+OHLC_INTERVALS = {"1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000}
+DEFAULT_OHLC_INTERVAL = "1h"
+ALERT_DIRECTIONS = ("above", "below")
+EXPORT_CHUNK_ROWS = 1000
+EXPORT_MAX_COINS = 25
+EXPORT_MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+FINGERPRINTED_ASSETS = ("css/style.css", "js/main.js")
+VENDOR_ASSETS = {
+    "vendor/chart.umd.min.js": (
+        "https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js",
+        "sha256-0q+JdOlScWOHcunpUk21uab1jW7C1deBQARHtKMcaB4=",
+    ),
+}
+ASSET_MANIFEST_NAME = "manifest.json"
+ASSET_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PROVIDER_TIMEOUT_SECONDS = 10
+LATENCY_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY = 1.0
+HEDGE_MIN_DELAY = 0.05
+PROVIDER_MAX_IN_FLIGHT = 4
+MOCK_MODES = ("static", "synthetic", "replay", "record")
+DEFAULT_RECORDING_FILE = "market_recording.ndjson.gz"
+SYNTHETIC_COINS = int(os.getenv("SYNTHETIC_COINS", "2000"))
+SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED", "42"))
+SYNTHETIC_POINTS = int(os.getenv("SYNTHETIC_POINTS", str(HISTORY_DAYS * 24)))
+SYNTHETIC_RESOLUTION_SECONDS = int(os.getenv("SYNTHETIC_RESOLUTION_SECONDS", "3600"))
+SYNTHETIC_VOLATILITY = 0.01
+SLOW_REQUEST_BUFFER = 100
+PROFILE_BUFFER = 20
+PROFILE_HEADER = "X-Profile"
+PROFILE_STATS_LINES = 40
 
 app = Flask(__name__)
 CORS(app)
 
 CacheEntry = Dict[str, Any]
+AlertSink = Callable[[Dict[str, Any]], None]
 
 cache: Dict[str, Any] = {
     "cryptos": {"data": None, "timestamp": None},
     "history": {},
+    "ohlc": {},
+}
+
+alerts: Dict[str, Any] = {
+    "rules": {},
+    "index": {},
+    "last_prices": {},
 }
+alert_lock = threading.Lock()
+alert_ids = count(1)
+triggered_alerts: "Queue[Dict[str, Any]]" = Queue()
+alert_deliveries: "Queue[Dict[str, Any]]" = Queue()
+alert_worker_lock = threading.Lock()
+alert_worker: Optional[threading.Thread] = None
+
+request_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_phases", default=None
+)
+inline_provider_calls: ContextVar[bool] = ContextVar("inline_provider_calls", default=False)
+slow_requests: "deque[Dict[str, Any]]" = deque(maxlen=SLOW_REQUEST_BUFFER)
+request_profiles: "deque[Dict[str, Any]]" = deque(maxlen=PROFILE_BUFFER)
+profile_ids = count(1)
 
 
 def _env_flag(name: str, default: str = "0") -> bool:
@@ -37,6 +155,12 @@ def _env_flag(name: str, default: str = "0") -> bool:
 
 
 app.config.setdefault("USE_MOCK_DATA", _env_flag("MOCK_COINGECKO"))
+app.config.setdefault("ASSET_DIST_DIR", os.path.join(app.static_folder, "dist"))
+app.config.setdefault(
+    "SLOW_REQUEST_THRESHOLD_MS", float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "500"))
+)
+app.config.setdefault("PROFILING_ENABLED", _env_flag("ENABLE_PROFILING"))
+app.config.setdefault("DEBUG_ENDPOINTS_ENABLED", _env_flag("ENABLE_DEBUG_ENDPOINTS"))
 
 MOCK_MARKET_DATA: List[Dict[str, Any]] = [
     {
@@ -59,21 +183,61 @@ MOCK_MARKET_DATA: List[Dict[str, Any]] = [
             "market_cap": 10_000_000_000 + index * 1_000_000_000,
             "image": "https://via.placeholder.com/64",
             "total_volume": 500_000_000 + index * 100_000_000,
+            "sparkline_in_7d": {
+                "price": [
+                    1000 + index * 10 + ((-1) ** (hour // 24)) * (hour % 24) * 0.5
+                    for hour in range(HISTORY_DAYS * 24)
+                ]
+            },
         }
         for index in range(1, 11)
     ],
 ][:TOP_LIMIT]
 
 
-def set_mock_data(enabled: bool = True) -> None:
+def set_mock_data(enabled: Union[bool, str] = True) -> None:
+    """Enable the static mock (``True``) or one of ``MOCK_MODES`` by name."""
     app.config["USE_MOCK_DATA"] = enabled
+    mock_providers.clear()
+
 
+def _parse_mock_mode(value: Union[bool, str, None]) -> Optional[str]:
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered in MOCK_MODES:
+            return lowered
+        return "static" if lowered in {"1", "true", "yes"} else None
+    return "static" if value else None
 
-def use_mock_data() -> bool:
+
+def mock_mode() -> Optional[str]:
     env_override = os.getenv("MOCK_COINGECKO")
     if env_override is not None:
-        return _env_flag("MOCK_COINGECKO")
-    return bool(app.config.get("USE_MOCK_DATA"))
+        return _parse_mock_mode(env_override)
+    return _parse_mock_mode(app.config.get("USE_MOCK_DATA"))
+
+
+class PhaseTimer:
+    """Add the time spent in a block to the current request's phase breakdown.
+
+    Outside a sampled request ``request_phases`` is ``None`` and the block is
+    not timed at all.
+    """
+
+    __slots__ = ("name", "phases", "started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.phases = request_phases.get()
+
+    def __enter__(self) -> None:
+        if self.phases is not None:
+            self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.phases is not None:
+            elapsed = time.perf_counter() - self.started
+            self.phases[self.name] = self.phases.get(self.name, 0.0) + elapsed
 
 
 def format_timestamp(value: Optional[datetime]) -> Optional[str]:
@@ -83,47 +247,795 @@ def format_timestamp(value: Optional[datetime]) -> Optional[str]:
     return aware_value.isoformat().replace("+00:00", "Z")
 
 
+def downsample_series(
+    values: List[float], points: int = SPARKLINE_POINTS
+) -> Tuple[float, ...]:
+    """Reduce a series to ``points`` evenly spaced samples, keeping both ends."""
+    count = len(values)
+    if count <= points:
+        return tuple(round(value, SPARKLINE_PRECISION) for value in values)
+    step = (count - 1) / (points - 1)
+    return tuple(
+        round(values[round(index * step)], SPARKLINE_PRECISION)
+        for index in range(points)
+    )
+
+
+def extract_sparkline(entry: Dict[str, Any]) -> Optional[Tuple[float, ...]]:
+    sparkline = entry.get("sparkline_in_7d") or {}
+    prices = [price for price in sparkline.get("price") or [] if price is not None]
+    if not prices:
+        return None
+    return downsample_series(prices)
+
+
+def _project_market_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy ``MARKET_FIELDS`` out of ``entry``; spelled out because it runs per coin."""
+    get = entry.get
+    return {
+        "id": get("id"),
+        "symbol": get("symbol"),
+        "name": get("name"),
+        "current_price": get("current_price"),
+        "price_change_percentage_24h": get("price_change_percentage_24h"),
+        "market_cap": get("market_cap"),
+        "image": get("image"),
+        "total_volume": get("total_volume"),
+    }
+
+
+@lru_cache(maxsize=128)
+def compile_projector(fields: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build a function that copies ``fields`` out of an entry into a new dict.
+
+    Market fields are always present (``None`` when missing upstream), while
+    ``OPTIONAL_FIELDS`` are only copied when the entry has them. The full
+    ``MARKET_FIELDS`` set used by ``sanitize_market_data`` gets a specialised
+    projector that skips the per-field loop.
+    """
+    if not PROJECTABLE_FIELDS.issuperset(fields):
+        raise ValueError(f"Unknown fields: {sorted(set(fields) - PROJECTABLE_FIELDS)}")
+    if fields == MARKET_FIELDS:
+        return _project_market_fields
+    required = tuple(field for field in fields if field not in OPTIONAL_FIELDS)
+    optional = tuple(field for field in fields if field in OPTIONAL_FIELDS)
+
+    def project(entry: Dict[str, Any]) -> Dict[str, Any]:
+        item = {field: entry.get(field) for field in required}
+        for field in optional:
+            if field in entry:
+                item[field] = entry[field]
+        return item
+
+    return project
+
+
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Turn a ``?fields=`` value into an ordered, de-duplicated tuple of field names."""
+    if not raw:
+        return None
+    fields = tuple(dict.fromkeys(field.strip() for field in raw.split(",") if field.strip()))
+    unknown = [field for field in fields if field not in PROJECTABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+    return fields or None
+
+
+def project_entries(
+    entries: List[Dict[str, Any]], fields: Optional[Tuple[str, ...]]
+) -> List[Dict[str, Any]]:
+    if fields is None:
+        return entries
+    project = compile_projector(fields)
+    return [project(entry) for entry in entries]
+
+
 def sanitize_market_data(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    fields = [
-        "id",
-        "symbol",
-        "name",
-        "current_price",
-        "price_change_percentage_24h",
-        "market_cap",
-        "image",
-        "total_volume",
-    ]
+    project = compile_projector(MARKET_FIELDS)
+    sanitized = []
+    with PhaseTimer("sanitize"):
+        for entry in entries[:TOP_LIMIT]:
+            item = project(entry)
+            sparkline = extract_sparkline(entry)
+            if sparkline is not None:
+                item["sparkline"] = sparkline
+            sanitized.append(item)
+    return sanitized
+
+
+def log_alert_sink(alert: Dict[str, Any]) -> None:
+    app.logger.info(
+        "Alert %s: %s crossed %s %s (price %s)",
+        alert["id"],
+        alert["coin_id"],
+        alert["direction"],
+        alert["threshold"],
+        alert["price"],
+    )
+
+
+def queue_alert_sink(alert: Dict[str, Any]) -> None:
+    triggered_alerts.put(alert)
+
+
+def make_webhook_sink(url: str) -> AlertSink:
+    def webhook_sink(alert: Dict[str, Any]) -> None:
+        try:
+            requests.post(url, json=alert, timeout=5)
+        except RequestException:
+            app.logger.warning("Unable to deliver alert %s to %s", alert["id"], url)
+
+    return webhook_sink
+
+
+alert_sinks: List[AlertSink] = [log_alert_sink, queue_alert_sink]
+if os.getenv("ALERT_WEBHOOK_URL"):
+    alert_sinks.append(make_webhook_sink(os.environ["ALERT_WEBHOOK_URL"]))
+
+
+def register_alert_sink(sink: AlertSink) -> None:
+    alert_sinks.append(sink)
+
+
+def add_alert_rule(coin_id: str, direction: str, threshold: float) -> Dict[str, Any]:
+    if not math.isfinite(threshold):
+        raise ValueError("threshold must be a finite number.")
+    rule = {
+        "id": next(alert_ids),
+        "coin_id": coin_id,
+        "direction": direction,
+        "threshold": float(threshold),
+        "created_at": format_timestamp(datetime.now(UTC)),
+    }
+    with alert_lock:
+        alerts["rules"][rule["id"]] = rule
+        index = alerts["index"].setdefault(coin_id, {"above": [], "below": []})
+        insort(index[direction], (rule["threshold"], rule["id"]))
+    return rule
+
+
+def remove_alert_rule(rule_id: int) -> bool:
+    with alert_lock:
+        rule = alerts["rules"].pop(rule_id, None)
+        if rule is None:
+            return False
+        entries = alerts["index"][rule["coin_id"]][rule["direction"]]
+        del entries[bisect_left(entries, (rule["threshold"], rule_id))]
+    return True
+
+
+def _pop_crossed_rules(
+    index: Dict[str, List[Tuple[float, int]]], previous: float, current: float
+) -> List[Tuple[float, int]]:
+    """Remove and return the rules whose threshold lies between two prices.
+
+    Crossed thresholds form a contiguous slice of the sorted array, so the
+    lookup is two bisections plus the size of the slice.
+    """
+    if current > previous:
+        entries = index["above"]
+        start = bisect_right(entries, previous, key=itemgetter(0))
+        end = bisect_right(entries, current, key=itemgetter(0))
+    elif current < previous:
+        entries = index["below"]
+        start = bisect_left(entries, current, key=itemgetter(0))
+        end = bisect_left(entries, previous, key=itemgetter(0))
+    else:
+        return []
+    crossed = entries[start:end]
+    del entries[start:end]
+    return crossed
+
+
+def evaluate_alerts(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fire the rules crossed since the previous refresh and queue them for the sinks."""
+    triggered = []
+    triggered_at = format_timestamp(datetime.now(UTC))
+    with alert_lock:
+        for entry in entries:
+            coin_id, price = entry.get("id"), entry.get("current_price")
+            if price is None:
+                continue
+            previous = alerts["last_prices"].get(coin_id)
+            alerts["last_prices"][coin_id] = price
+            index = alerts["index"].get(coin_id)
+            if previous is None or index is None:
+                continue
+            for _, rule_id in _pop_crossed_rules(index, previous, price):
+                rule = alerts["rules"].pop(rule_id)
+                triggered.append(
+                    {
+                        **rule,
+                        "price": price,
+                        "previous_price": previous,
+                        "triggered_at": triggered_at,
+                    }
+                )
+    if triggered:
+        start_alert_worker()
+    for alert in triggered:
+        alert_deliveries.put(alert)
+    return triggered
+
+
+def _deliver_alerts() -> None:
+    while True:
+        alert = alert_deliveries.get()
+        try:
+            for sink in list(alert_sinks):
+                try:
+                    sink(alert)
+                except Exception:
+                    app.logger.exception("Alert sink %r failed", sink)
+        finally:
+            alert_deliveries.task_done()
+
+
+def start_alert_worker() -> None:
+    """Start the background thread that hands triggered alerts to the sinks.
+
+    Sinks may block (the webhook waits up to 5 s), so delivery never runs on
+    the request that refreshed the market.
+    """
+    global alert_worker
+    with alert_worker_lock:
+        if alert_worker is None or not alert_worker.is_alive():
+            alert_worker = threading.Thread(
+                target=_deliver_alerts, name="alert-delivery", daemon=True
+            )
+            alert_worker.start()
+
+
+class LatencyStats:
+    """Rolling window of successful call durations for one provider."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.samples: "deque[float]" = deque(maxlen=window)
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self.lock:
+            self.samples.append(seconds)
+
+    def record_error(self) -> None:
+        with self.lock:
+            self.errors += 1
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        with self.lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def hedge_delay(self, timeout: float) -> float:
+        """Seconds to wait before hedging: the observed p95 once enough samples exist."""
+        with self.lock:
+            enough = len(self.samples) >= HEDGE_MIN_SAMPLES
+        delay = self.percentile(0.95) if enough else HEDGE_DEFAULT_DELAY
+        return min(max(delay, HEDGE_MIN_DELAY), timeout)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "samples": len(self.samples),
+            "errors": self.errors,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+        }
+
+
+class MarketDataProvider:
+    """Source of market data normalized to the ``sanitize_market_data`` schema."""
+
+    name = "base"
+
+    def __init__(self, timeout: float = PROVIDER_TIMEOUT_SECONDS) -> None:
+        self.timeout = timeout
+        self.latency = LatencyStats()
+        self.slots = threading.BoundedSemaphore(PROVIDER_MAX_IN_FLIGHT)
+        self.executor = ThreadPoolExecutor(
+            max_workers=PROVIDER_MAX_IN_FLIGHT, thread_name_prefix="provider"
+        )
+
+    def fetch_markets(self, limit: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def fetch_history(self, coin_id: str, days: int) -> List[List[float]]:
+        raise NotImplementedError
+
+    def _get_json(
+        self, url: str, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        with PhaseTimer("upstream"):
+            response = requests.get(url, params=params, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        with PhaseTimer("decode"):
+            return response.json()
+
+    def submit(self, operation: str, *args: Any, block: bool = False) -> Optional[Future]:
+        """Run ``call`` on this provider's own pool, or return ``None`` when it is saturated.
+
+        The pool has one worker per in-flight slot, so calls never queue inside
+        the executor. With ``block`` the caller waits up to ``timeout`` for a free
+        slot instead; that wait counts towards the recorded latency, which is
+        timed from submission so it matches what callers actually see. Phases
+        timed by the call go to a dict of its own, exposed as ``future.phases``,
+        so concurrent hedges never share one.
+        """
+        submitted = time.perf_counter()
+        acquired = (
+            self.slots.acquire(timeout=self.timeout) if block else self.slots.acquire(blocking=False)
+        )
+        if not acquired:
+            return None
+        context = copy_context()
+        phases: Optional[Dict[str, float]] = None
+        if request_phases.get() is not None:
+            phases = {}
+            context.run(request_phases.set, phases)
+        future = self.executor.submit(context.run, self.call, operation, *args, submitted=submitted)
+        future.phases = phases
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def call(self, operation: str, *args: Any, submitted: Optional[float] = None) -> Any:
+        started = time.perf_counter() if submitted is None else submitted
+        try:
+            result = getattr(self, operation)(*args)
+            validate_provider_result(operation, result)
+        except Exception:
+            self.latency.record_error()
+            raise
+        self.latency.record(time.perf_counter() - started)
+        return result
+
+
+class CoinGeckoProvider(MarketDataProvider):
+    name = "coingecko"
+
+    def __init__(
+        self,
+        markets_url: Optional[str] = None,
+        history_url: Optional[str] = None,
+        timeout: float = PROVIDER_TIMEOUT_SECONDS,
+    ) -> None:
+        super().__init__(timeout)
+        self.markets_url = markets_url
+        self.history_url = history_url
+
+    def fetch_markets(self, limit: int) -> List[Dict[str, Any]]:
+        params = {
+            "vs_currency": VS_CURRENCY,
+            "order": "market_cap_desc",
+            "per_page": limit,
+            "page": 1,
+            "sparkline": "true",
+        }
+        url = self.markets_url or COINGECKO_MARKETS_URL
+        return sanitize_market_data(self._get_json(url, params))
+
+    def fetch_history(self, coin_id: str, days: int) -> List[List[float]]:
+        params = {"vs_currency": VS_CURRENCY, "days": days}
+        url = (self.history_url or COINGECKO_HISTORY_URL).format(coin_id=coin_id)
+        return self._get_json(url, params).get("prices", [])
+
+
+class CoinCapProvider(MarketDataProvider):
+    """CoinCap v3 assets, with ids translated to CoinGecko's namespace.
+
+    Slugs missing from ``COINCAP_TO_COINGECKO_IDS`` are assumed to match.
+    """
+
+    name = "coincap"
+
+    def __init__(
+        self,
+        assets_url: Optional[str] = None,
+        history_url: Optional[str] = None,
+        timeout: float = PROVIDER_TIMEOUT_SECONDS,
+        api_key: Optional[str] = None,
+    ) -> None:
+        super().__init__(timeout)
+        self.assets_url = assets_url
+        self.history_url = history_url
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+
+    @staticmethod
+    def _number(value: Any) -> Optional[float]:
+        return float(value) if value is not None else None
+
+    def fetch_markets(self, limit: int) -> List[Dict[str, Any]]:
+        url = self.assets_url or COINCAP_ASSETS_URL
+        payload = self._get_json(url, {"limit": limit}, self.headers)
+        return sanitize_market_data(
+            [
+                {
+                    "id": COINCAP_TO_COINGECKO_IDS.get(asset.get("id"), asset.get("id")),
+                    "symbol": (asset.get("symbol") or "").lower(),
+                    "name": asset.get("name"),
+                    "current_price": self._number(asset.get("priceUsd")),
+                    "price_change_percentage_24h": self._number(
+                        asset.get("changePercent24Hr")
+                    ),
+                    "market_cap": self._number(asset.get("marketCapUsd")),
+                    "image": COINCAP_ICON_URL.format(symbol=(asset.get("symbol") or "").lower()),
+                    "total_volume": self._number(asset.get("volumeUsd24Hr")),
+                }
+                for asset in payload.get("data", [])
+            ]
+        )
+
+    def fetch_history(self, coin_id: str, days: int) -> List[List[float]]:
+        end = int(time.time() * 1000)
+        params = {"interval": "h1", "start": end - days * 86_400_000, "end": end}
+        slug = COINGECKO_TO_COINCAP_IDS.get(coin_id, coin_id)
+        url = (self.history_url or COINCAP_HISTORY_URL).format(coin_id=slug)
+        return [
+            [point["time"], float(point["priceUsd"])]
+            for point in self._get_json(url, params, self.headers).get("data", [])
+        ]
+
+
+class FileProvider(MarketDataProvider):
+    """Serve markets and history from a local JSON snapshot.
+
+    The file holds ``{"markets": [...], "history": {"<coin_id>": [[ts, price], ...]}}``.
+    """
+
+    name = "file"
+
+    def __init__(self, path: str, timeout: float = PROVIDER_TIMEOUT_SECONDS) -> None:
+        super().__init__(timeout)
+        self.path = path
+        self.snapshot: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self.snapshot is None:
+            try:
+                with open(self.path, encoding="utf-8") as handle:
+                    self.snapshot = json.load(handle)
+            except (OSError, ValueError) as error:
+                raise RequestException(f"Unable to read {self.path}: {error}") from error
+        return self.snapshot
+
+    def fetch_markets(self, limit: int) -> List[Dict[str, Any]]:
+        return sanitize_market_data(self._load().get("markets", []))[:limit]
+
+    def fetch_history(self, coin_id: str, days: int) -> List[List[float]]:
+        history = self._load().get("history", {})
+        if coin_id not in history:
+            raise RequestException(f"No recorded history for {coin_id}.")
+        return history[coin_id]
+
+
+def _random_walk(rng: random.Random, points: int, end_price: float) -> List[float]:
+    """Random walk of ``points`` prices from cumulative log-returns, ending at ``end_price``."""
+    steps = [rng.gauss(0, SYNTHETIC_VOLATILITY) for _ in range(points - 1)]
+    levels = list(accumulate(steps, initial=0.0))
+    offset = levels[-1]
+    return [round(end_price * math.exp(level - offset), 8) for level in levels]
+
+
+@lru_cache(maxsize=8)
+def generate_synthetic_markets(coins: int, seed: int) -> Tuple[Dict[str, Any], ...]:
+    """Deterministic market list of ``coins`` entries, ordered by market cap."""
+    rng = random.Random(seed)
+    prices = [math.exp(rng.uniform(-4, 11)) for _ in range(coins)]
+    supplies = [math.exp(rng.uniform(14, 23)) for _ in range(coins)]
+    changes = [rng.gauss(0, 4) for _ in range(coins)]
+    volumes = [rng.uniform(0.01, 0.2) for _ in range(coins)]
+    caps = [price * supply for price, supply in zip(prices, supplies)]
+    order = sorted(range(coins), key=caps.__getitem__, reverse=True)
+    return tuple(
+        {
+            "id": f"synthetic-{index}",
+            "symbol": f"syn{index}",
+            "name": f"Synthetic {index}",
+            "current_price": round(prices[index], 8),
+            "price_change_percentage_24h": round(changes[index], 2),
+            "market_cap": round(caps[index]),
+            "image": "https://via.placeholder.com/64",
+            "total_volume": round(caps[index] * volumes[index]),
+        }
+        for index in order
+    )
+
+
+def generate_synthetic_history(
+    coin_id: str,
+    end_price: float,
+    seed: int = SYNTHETIC_SEED,
+    points: int = SYNTHETIC_POINTS,
+    resolution_seconds: int = SYNTHETIC_RESOLUTION_SECONDS,
+    end_ms: Optional[int] = None,
+) -> List[List[float]]:
+    """Deterministic price series for one coin; the same inputs always give the same prices."""
+    resolution_ms = resolution_seconds * 1000
+    if end_ms is None:
+        end_ms = int(time.time() * 1000)
+    end_ms -= end_ms % resolution_ms
+    start_ms = end_ms - (points - 1) * resolution_ms
+    walk = _random_walk(random.Random(f"{seed}:{coin_id}"), points, end_price)
+    return [[start_ms + index * resolution_ms, price] for index, price in enumerate(walk)]
+
+
+class SyntheticProvider(MarketDataProvider):
+    name = "synthetic"
+
+    def __init__(
+        self,
+        coins: int = SYNTHETIC_COINS,
+        seed: int = SYNTHETIC_SEED,
+        points: int = SYNTHETIC_POINTS,
+        resolution_seconds: int = SYNTHETIC_RESOLUTION_SECONDS,
+    ) -> None:
+        super().__init__()
+        self.coins = coins
+        self.seed = seed
+        self.points = points
+        self.resolution_seconds = resolution_seconds
+
+    def fetch_markets(self, limit: int) -> List[Dict[str, Any]]:
+        markets = generate_synthetic_markets(self.coins, self.seed)
+        return [dict(entry) for entry in markets[:limit]]
+
+    def fetch_history(self, coin_id: str, days: int) -> List[List[float]]:
+        markets = generate_synthetic_markets(self.coins, self.seed)
+        prices = {entry["id"]: entry["current_price"] for entry in markets}
+        if coin_id not in prices:
+            raise RequestException(f"Unknown synthetic coin {coin_id}.")
+        return generate_synthetic_history(
+            coin_id, prices[coin_id], self.seed, self.points, self.resolution_seconds
+        )
+
+
+recording_lock = threading.Lock()
+
+
+def _recording_key(operation: str, args: Tuple[Any, ...]) -> str:
+    if operation == "fetch_history":
+        return f"{operation}:{args[0]}"
+    return operation
+
+
+def record_market_response(
+    operation: str, args: Tuple[Any, ...], provider: str, latency: float, result: Any
+) -> None:
+    """Append the response served to a caller, with its latency, to ``MARKET_RECORD_FILE``."""
+    record = {
+        "key": _recording_key(operation, args),
+        "provider": provider,
+        "recorded_at": time.time(),
+        "latency": latency,
+        "result": result,
+    }
+    line = json.dumps(record) + "\n"
+    path = os.getenv("MARKET_RECORD_FILE", DEFAULT_RECORDING_FILE)
+    with recording_lock, gzip.open(path, "at", encoding="utf-8") as handle:
+        handle.write(line)
+
+
+class ReplayProvider(MarketDataProvider):
+    """Serve recorded responses in order, sleeping for their original latency.
+
+    ``speed`` scales the delays (2.0 replays twice as fast, 0 disables them).
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.records: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self.positions: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self.records is None:
+            records: Dict[str, List[Dict[str, Any]]] = {}
+            try:
+                with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+                    for line in handle:
+                        record = json.loads(line)
+                        records.setdefault(record["key"], []).append(record)
+            except (OSError, ValueError) as error:
+                raise RequestException(f"Unable to read {self.path}: {error}") from error
+            self.records = records
+        return self.records
+
+    def _replay(self, operation: str, *args: Any) -> Any:
+        key = _recording_key(operation, args)
+        records = self._load().get(key)
+        if not records:
+            raise RequestException(f"No recorded response for {key}.")
+        with self.lock:
+            position = self.positions.get(key, 0)
+            self.positions[key] = (position + 1) % len(records)
+        record = records[position]
+        if self.speed:
+            time.sleep(record["latency"] / self.speed)
+        return record["result"]
+
+    def fetch_markets(self, limit: int) -> List[Dict[str, Any]]:
+        return self._replay("fetch_markets", limit)[:limit]
+
+    def fetch_history(self, coin_id: str, days: int) -> List[List[float]]:
+        return self._replay("fetch_history", coin_id, days)
+
+
+def validate_provider_result(operation: str, result: Any) -> None:
+    if not isinstance(result, list):
+        raise ValueError(f"{operation} returned {type(result).__name__}, expected a list.")
+    if operation != "fetch_markets":
+        return
+    if not result:
+        raise ValueError("Provider returned no markets.")
+    if not all(entry.get("id") and entry.get("current_price") is not None for entry in result):
+        raise ValueError("Market entries need an id and a current_price.")
+
+
+def build_providers(names: Iterable[str]) -> List[MarketDataProvider]:
+    providers: List[MarketDataProvider] = []
+    for name in names:
+        if name == "coingecko":
+            providers.append(CoinGeckoProvider())
+        elif name == "coincap" and os.getenv("COINCAP_API_KEY"):
+            providers.append(CoinCapProvider(api_key=os.environ["COINCAP_API_KEY"]))
+        elif name == "file" and os.getenv("MARKET_DATA_FILE"):
+            providers.append(FileProvider(os.environ["MARKET_DATA_FILE"]))
+    return providers
+
+
+market_providers: List[MarketDataProvider] = build_providers(
+    name.strip() for name in os.getenv("MARKET_PROVIDERS", "coingecko,coincap").split(",")
+)
+
+mock_providers: Dict[str, List[MarketDataProvider]] = {}
+
+
+def set_market_providers(providers: List[MarketDataProvider]) -> None:
+    market_providers[:] = providers
+    mock_providers.clear()
+
+
+def providers_for_mode(mode: Optional[str]) -> List[MarketDataProvider]:
+    """Providers backing the given ``mock_mode()``; live providers when ``None`` or recording."""
+    if mode in (None, "record"):
+        return market_providers
+    if mode not in mock_providers:
+        if mode == "synthetic":
+            providers: List[MarketDataProvider] = [SyntheticProvider()]
+        else:
+            path = os.getenv("MARKET_REPLAY_FILE", DEFAULT_RECORDING_FILE)
+            speed = float(os.getenv("MARKET_REPLAY_SPEED", "1"))
+            providers = [ReplayProvider(path, speed)]
+        mock_providers[mode] = providers
+    return mock_providers[mode]
+
+
+def _merge_phases(phases: Optional[Dict[str, float]]) -> None:
+    target = request_phases.get()
+    if target is not None and phases:
+        for name, seconds in phases.items():
+            target[name] = target.get(name, 0.0) + seconds
+
+
+def _sequential_fetch(
+    providers: List[MarketDataProvider], operation: str, *args: Any
+) -> Tuple[Any, str]:
+    """Fail over through ``providers`` on the calling thread, without hedging.
+
+    Used while a request is being profiled, since cProfile only sees the
+    thread that enabled it.
+    """
+    errors: List[str] = []
+    for provider in providers:
+        try:
+            return provider.call(operation, *args), provider.name
+        except Exception as error:
+            errors.append(f"{provider.name}: {error!r}")
+    raise RequestException("; ".join(errors) or "No market data providers configured.")
+
+
+def hedged_fetch(
+    operation: str, *args: Any, providers: Optional[List[MarketDataProvider]] = None
+) -> Tuple[Any, str]:
+    """Call providers in order, hedging to the next one when the current is slow.
+
+    A provider is hedged once it has been outstanding for its observed p95, and
+    failed over immediately on any error, including malformed payloads. Saturated
+    providers are skipped while another can still be launched; the last option
+    waits for a free slot instead of failing the request. The first valid result wins and still-queued losers
+    are cancelled; if every provider fails a ``RequestException`` is raised.
+    Only the winner's phases are added to the request's breakdown.
+    """
+    providers = list(market_providers if providers is None else providers)
+    if inline_provider_calls.get():
+        return _sequential_fetch(providers, operation, *args)
+    pending: Dict[Future, MarketDataProvider] = {}
+    errors: List[str] = []
+    launched = 0
+    latest: Optional[MarketDataProvider] = None
+
+    def launch_next() -> None:
+        nonlocal launched, latest
+        while launched < len(providers):
+            provider = providers[launched]
+            launched += 1
+            last_option = launched == len(providers) and not pending
+            future = provider.submit(operation, *args, block=last_option)
+            if future is None:
+                errors.append(f"{provider.name}: too many requests in flight")
+                continue
+            pending[future] = provider
+            latest = provider
+            return
+
+    launch_next()
+    while pending:
+        can_hedge = launched < len(providers)
+        timeout = latest.latency.hedge_delay(latest.timeout) if can_hedge else None
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            provider = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as error:
+                errors.append(f"{provider.name}: {error!r}")
+                continue
+            for loser in pending:
+                loser.cancel()
+            _merge_phases(future.phases)
+            return result, provider.name
+        if can_hedge:
+            launch_next()
+    raise RequestException("; ".join(errors) or "No market data providers configured.")
+
+
+def _carry_over_sparklines(
+    entries: List[Dict[str, Any]], previous: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Keep the last known sparkline when a provider without one answers."""
+    sparklines = {entry["id"]: entry["sparkline"] for entry in previous if "sparkline" in entry}
     return [
-        {field: entry.get(field) for field in fields}
-        for entry in entries[:TOP_LIMIT]
+        {**entry, "sparkline": sparklines[entry["id"]]}
+        if "sparkline" not in entry and entry["id"] in sparklines
+        else entry
+        for entry in entries
     ]
 
 
+def fetch_from_providers(mode: Optional[str], operation: str, *args: Any) -> Any:
+    """Run ``hedged_fetch`` for ``mode``; in record mode, save only the winning response."""
+    started = time.perf_counter()
+    result, provider = hedged_fetch(operation, *args, providers=providers_for_mode(mode))
+    if mode == "record":
+        record_market_response(operation, args, provider, time.perf_counter() - started, result)
+    return result
+
+
 def fetch_top_cryptos() -> List[Dict[str, Any]]:
-    if use_mock_data():
+    mode = mock_mode()
+    if mode == "static":
         sanitized = sanitize_market_data(MOCK_MARKET_DATA)
         cache["cryptos"]["data"] = sanitized
         cache["cryptos"]["timestamp"] = datetime.now(UTC)
+        evaluate_alerts(sanitized)
         return sanitized
 
-    params = {
-        "vs_currency": VS_CURRENCY,
-        "order": "market_cap_desc",
-        "per_page": TOP_LIMIT,
-        "page": 1,
-        "sparkline": "false",
-    }
-    response = requests.get(COINGECKO_MARKETS_URL, params=params, timeout=10)
-    response.raise_for_status()
-    sanitized = sanitize_market_data(response.json())
+    sanitized = fetch_from_providers(mode, "fetch_markets", TOP_LIMIT)
+    sanitized = _carry_over_sparklines(sanitized, cache["cryptos"]["data"] or [])
     cache["cryptos"]["data"] = sanitized
     cache["cryptos"]["timestamp"] = datetime.now(UTC)
+    evaluate_alerts(sanitized)
     return sanitized
 
 
 def fetch_crypto_history(coin_id: str) -> Dict[str, Any]:
-    if use_mock_data():
+    mode = mock_mode()
+    if mode == "static":
         now = datetime.now(UTC)
         prices = [
             [int((now - timedelta(days=offset)).timestamp() * 1000), 1000 + offset * 5]
@@ -136,11 +1048,8 @@ def fetch_crypto_history(coin_id: str) -> Dict[str, Any]:
         }
         return payload
 
-    params = {"vs_currency": VS_CURRENCY, "days": HISTORY_DAYS}
-    url = COINGECKO_HISTORY_URL.format(coin_id=coin_id)
-    response = requests.get(url, params=params, timeout=10)
-    response.raise_for_status()
-    payload = {"id": coin_id, "prices": response.json().get("prices", [])}
+    prices = fetch_from_providers(mode, "fetch_history", coin_id, HISTORY_DAYS)
+    payload = {"id": coin_id, "prices": prices}
     cache["history"][coin_id] = {
         "data": payload,
         "timestamp": datetime.now(UTC),
@@ -148,6 +1057,92 @@ def fetch_crypto_history(coin_id: str) -> Dict[str, Any]:
     return payload
 
 
+def aggregate_ohlc(prices: List[List[float]], interval_ms: int) -> List[List[float]]:
+    """Group ascending ``[timestamp, price]`` points into ``[bucket, o, h, l, c]``."""
+    candles = []
+    for bucket, points in groupby(prices, key=lambda point: point[0] - point[0] % interval_ms):
+        values = [price for _, price in points]
+        candles.append([bucket, values[0], max(values), min(values), values[-1]])
+    return candles
+
+
+def update_ohlc_rollup(coin_id: str, interval: str, prices: List[List[float]]) -> CacheEntry:
+    """Refresh the cached candles for ``(coin_id, interval)``.
+
+    When the new series still covers the cached trailing bucket, only that
+    bucket and any newer ones are recomputed, plus the leading bucket if the
+    window start moved inside it; otherwise the rollup is rebuilt.
+    """
+    interval_ms = OHLC_INTERVALS[interval]
+    ordered = sorted((point for point in prices if point[1] is not None), key=itemgetter(0))
+    key = (coin_id, interval)
+    entry = cache["ohlc"].get(key)
+    candles: List[List[float]] = []
+    if ordered:
+        first_bucket = ordered[0][0] - ordered[0][0] % interval_ms
+        previous = entry["candles"] if entry else []
+        if previous and first_bucket < previous[-1][0]:
+            trailing_start = previous[-1][0]
+            tail_index = bisect_left(ordered, trailing_start, key=itemgetter(0))
+            kept_from = first_bucket
+            if entry.get("first_point") != ordered[0][0]:
+                kept_from = first_bucket + interval_ms
+                lead_index = bisect_left(ordered, kept_from, key=itemgetter(0))
+                candles = aggregate_ohlc(ordered[:lead_index], interval_ms)
+            candles.extend(candle for candle in previous[:-1] if candle[0] >= kept_from)
+            candles.extend(aggregate_ohlc(ordered[tail_index:], interval_ms))
+        else:
+            candles = aggregate_ohlc(ordered, interval_ms)
+    entry = {
+        "candles": candles,
+        "first_point": ordered[0][0] if ordered else None,
+        "timestamp": datetime.now(UTC),
+    }
+    cache["ohlc"][key] = entry
+    return entry
+
+
+def _export_points(
+    coin_ids: Iterable[str], start: Optional[int], end: Optional[int]
+) -> Iterator[Tuple[str, int, float]]:
+    for coin_id in coin_ids:
+        entry = cache["history"].get(coin_id)
+        if not entry:
+            continue
+        for timestamp, price in entry["data"]["prices"]:
+            if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                yield coin_id, timestamp, price
+
+
+def stream_csv(points: Iterator[Tuple[str, int, float]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(("id", "timestamp", "price"))
+    rows = 0
+    for point in points:
+        writer.writerow(point)
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_ndjson(points: Iterator[Tuple[str, int, float]]) -> Iterator[str]:
+    chunk = []
+    for coin_id, timestamp, price in points:
+        chunk.append(json.dumps({"id": coin_id, "timestamp": timestamp, "price": price}))
+        if len(chunk) == EXPORT_CHUNK_ROWS:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+EXPORT_WRITERS = {"csv": stream_csv, "ndjson": stream_ndjson}
+
+
 def build_cached_response(entry: CacheEntry, source: str) -> Dict[str, Any]:
     return {
         "data": entry.get("data"),
@@ -156,20 +1151,280 @@ def build_cached_response(entry: CacheEntry, source: str) -> Dict[str, Any]:
     }
 
 
+def conditional_json(payload: Dict[str, Any]) -> Response:
+    """Serialize ``payload`` with an ETag, answering 304 when the client already has it."""
+    with PhaseTimer("serialize"):
+        response = jsonify(payload)
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def _should_profile() -> bool:
+    return bool(app.config.get("PROFILING_ENABLED")) and PROFILE_HEADER in request.headers
+
+
+@app.before_request
+def start_request_instrumentation() -> None:
+    threshold = app.config.get("SLOW_REQUEST_THRESHOLD_MS")
+    sampling = threshold is not None and threshold >= 0
+    request_phases.set({} if sampling else None)
+    inline_provider_calls.set(False)
+    g.request_started = time.perf_counter()
+    if _should_profile():
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active (Python 3.12+).
+            return
+        g.profiler = profiler
+        inline_provider_calls.set(True)
+
+
+def store_profile(profiler: cProfile.Profile, duration_ms: float) -> Dict[str, Any]:
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_STATS_LINES)
+    stats.print_stats(re.escape(os.path.abspath(__file__)))
+    profile = {
+        "id": next(profile_ids),
+        "method": request.method,
+        "path": request.full_path.rstrip("?"),
+        "duration_ms": round(duration_ms, 3),
+        "created_at": format_timestamp(datetime.now(UTC)),
+        "stats": buffer.getvalue(),
+    }
+    request_profiles.append(profile)
+    return profile
+
+
+def record_slow_request(
+    phases: Dict[str, float], duration_ms: float, status_code: int
+) -> Dict[str, Any]:
+    """Keep the phase breakdown of a slow request in the ``slow_requests`` ring buffer."""
+    breakdown = {name: round(seconds * 1000, 3) for name, seconds in phases.items()}
+    breakdown["other"] = round(max(duration_ms - sum(breakdown.values()), 0.0), 3)
+    sample = {
+        "method": request.method,
+        "path": request.full_path.rstrip("?"),
+        "status": status_code,
+        "duration_ms": round(duration_ms, 3),
+        "recorded_at": format_timestamp(datetime.now(UTC)),
+        "phases": breakdown,
+    }
+    slow_requests.append(sample)
+    return sample
+
+
+@app.after_request
+def finish_request_instrumentation(response: Response) -> Response:
+    """Store the profile of profiled requests and sample those above the threshold."""
+    started = g.get("request_started")
+    if started is None:
+        return response
+    duration_ms = (time.perf_counter() - started) * 1000
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        profile = store_profile(profiler, duration_ms)
+        response.headers["X-Profile-Id"] = str(profile["id"])
+    phases = request_phases.get()
+    if phases is not None and duration_ms >= app.config["SLOW_REQUEST_THRESHOLD_MS"]:
+        record_slow_request(dict(phases), duration_ms, response.status_code)
+    return response
+
+
+def minify_asset(name: str, text: str) -> str:
+    """Strip comments and redundant whitespace from CSS and JS sources.
+
+    This is deliberately conservative: JS only loses indentation, blank lines
+    and whole-line ``//`` comments, so no statement is ever rewritten.
+    """
+    if name.endswith(".min.js"):
+        return text
+    if name.endswith(".css"):
+        text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
+        text = re.sub(r"\s+", " ", text)
+        return re.sub(r"\s*([{};,])\s*", r"\1", text).strip()
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//")) + "\n"
+
+
+def fingerprint_name(name: str, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{digest}{extension}"
+
+
+def vendor_asset(name: str, source_dir: str) -> bool:
+    """Download a third-party asset into ``source_dir`` after checking its SRI hash."""
+    url, integrity = VENDOR_ASSETS[name]
+    try:
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+    except RequestException:
+        return False
+    algorithm, expected = integrity.split("-", 1)
+    actual = base64.b64encode(hashlib.new(algorithm, response.content).digest()).decode()
+    if actual != expected:
+        return False
+    target = os.path.join(source_dir, name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as handle:
+        handle.write(response.content)
+    return True
+
+
+def build_static_assets(
+    source_dir: Optional[str] = None,
+    dist_dir: Optional[str] = None,
+    download_vendor: bool = True,
+) -> List[Dict[str, Any]]:
+    """Minify, fingerprint and precompress the first-paint assets.
+
+    Writes ``<name>.<hash>.<ext>`` plus ``.gz``/``.br`` siblings and a manifest
+    into ``dist_dir``, and returns the byte counts for each asset.
+    """
+    import brotli
+
+    source_dir = source_dir or app.static_folder
+    dist_dir = dist_dir or app.config["ASSET_DIST_DIR"]
+    names = list(FINGERPRINTED_ASSETS)
+    for name in VENDOR_ASSETS:
+        vendored = os.path.exists(os.path.join(source_dir, name))
+        if vendored or (download_vendor and vendor_asset(name, source_dir)):
+            names.append(name)
+
+    manifest: Dict[str, str] = {}
+    report = []
+    for name in names:
+        with open(os.path.join(source_dir, name), encoding="utf-8") as handle:
+            original = handle.read()
+        content = minify_asset(name, original).encode("utf-8")
+        hashed = fingerprint_name(name, content)
+        variants = {
+            "": content,
+            ".gz": gzip.compress(content, compresslevel=9, mtime=0),
+            ".br": brotli.compress(content, quality=11),
+        }
+        for suffix, data in variants.items():
+            target = os.path.join(dist_dir, hashed + suffix)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as handle:
+                handle.write(data)
+        manifest[name] = hashed
+        report.append(
+            {
+                "name": name,
+                "file": hashed,
+                "original": len(original.encode("utf-8")),
+                "minified": len(content),
+                "gzip": len(variants[".gz"]),
+                "br": len(variants[".br"]),
+            }
+        )
+
+    with open(os.path.join(dist_dir, ASSET_MANIFEST_NAME), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    asset_manifests.pop(dist_dir, None)
+    return report
+
+
+asset_manifests: Dict[str, Dict[str, str]] = {}
+
+
+def get_asset_manifest() -> Dict[str, str]:
+    dist_dir = app.config["ASSET_DIST_DIR"]
+    if dist_dir not in asset_manifests:
+        try:
+            with open(os.path.join(dist_dir, ASSET_MANIFEST_NAME), encoding="utf-8") as handle:
+                asset_manifests[dist_dir] = json.load(handle)
+        except FileNotFoundError:
+            asset_manifests[dist_dir] = {}
+    return asset_manifests[dist_dir]
+
+
+def has_asset(name: str) -> bool:
+    return name in get_asset_manifest()
+
+
+def asset_url(name: str) -> str:
+    hashed = get_asset_manifest().get(name)
+    if hashed:
+        return url_for("serve_asset", filename=hashed)
+    return url_for("static", filename=name)
+
+
+@app.context_processor
+def inject_asset_helpers() -> Dict[str, Any]:
+    return {"asset_url": asset_url, "has_asset": has_asset}
+
+
+@app.cli.command("build-assets")
+@click.option("--no-vendor", is_flag=True, help="Skip downloading third-party assets.")
+def build_assets_command(no_vendor: bool) -> None:
+    """Build fingerprinted, precompressed static assets."""
+    report = build_static_assets(download_vendor=not no_vendor)
+    for row in report:
+        click.echo(
+            f"{row['name']:<28} -> {row['file']:<40} "
+            f"{row['original']:>8} B  min {row['minified']:>8} B  "
+            f"gzip {row['gzip']:>7} B  br {row['br']:>7} B"
+        )
+    before = sum(row["original"] for row in report)
+    after = sum(row["br"] for row in report)
+    click.echo(f"First-paint bytes: {before} B before, {after} B after (brotli)")
+
+
+@app.route("/assets/<path:filename>", methods=["GET"])
+def serve_asset(filename: str):
+    dist_dir = app.config["ASSET_DIST_DIR"]
+    if filename not in get_asset_manifest().values():
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0]
+    served, encoding = filename, None
+    for candidate, suffix in ASSET_ENCODINGS:
+        compressed = filename + suffix
+        if request.accept_encodings.quality(candidate) > 0 and os.path.exists(
+            os.path.join(dist_dir, compressed)
+        ):
+            served, encoding = compressed, candidate
+            break
+    response = send_from_directory(dist_dir, served, mimetype=mimetype, etag=False)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
 @app.route("/", methods=["GET"])
 def home():
     return render_template("index.html")
 
 
+@app.route("/sw.js", methods=["GET"])
+def service_worker():
+    response = send_from_directory(app.static_folder, "js/sw.js", max_age=0)
+    response.headers["Service-Worker-Allowed"] = "/"
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 @app.route("/api/cryptos", methods=["GET"])
 def get_top_cryptos():
     try:
-        data = fetch_top_cryptos()
-        return jsonify({"data": data, "source": "live", "cached_at": None})
+        fields = parse_fields(request.args.get("fields"))
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+    try:
+        data = project_entries(fetch_top_cryptos(), fields)
+        return conditional_json({"data": data, "source": "live", "cached_at": None})
     except RequestException:
         cached = cache["cryptos"]
         if cached.get("data"):
-            return jsonify(build_cached_response(cached, "cache")), 200
+            projected = {**cached, "data": project_entries(cached["data"], fields)}
+            return conditional_json(build_cached_response(projected, "cache"))
         return jsonify({"error": "Unable to fetch cryptocurrency data."}), 502
 
 
@@ -177,13 +1432,162 @@ def get_top_cryptos():
 def get_crypto_history(coin_id: str):
     try:
         payload = fetch_crypto_history(coin_id)
-        return jsonify({"data": payload, "source": "live", "cached_at": None})
+        return conditional_json({"data": payload, "source": "live", "cached_at": None})
     except RequestException:
         history_entry = cache["history"].get(coin_id)
         if history_entry:
-            return jsonify(build_cached_response(history_entry, "cache")), 200
+            return conditional_json(build_cached_response(history_entry, "cache"))
         return jsonify({"error": f"Unable to fetch price history for {coin_id}."}), 502
 
 
+@app.route("/api/crypto/<string:coin_id>/ohlc", methods=["GET"])
+def get_crypto_ohlc(coin_id: str):
+    interval = request.args.get("interval", DEFAULT_OHLC_INTERVAL)
+    if interval not in OHLC_INTERVALS:
+        return jsonify({"error": f"Unsupported interval {interval}."}), 400
+    try:
+        prices = fetch_crypto_history(coin_id)["prices"]
+        source = "live"
+    except RequestException:
+        history_entry = cache["history"].get(coin_id)
+        if not history_entry:
+            return jsonify({"error": f"Unable to fetch OHLC data for {coin_id}."}), 502
+        prices = history_entry["data"]["prices"]
+        source = "cache"
+    entry = update_ohlc_rollup(coin_id, interval, prices)
+    payload = {"id": coin_id, "interval": interval, "candles": entry["candles"]}
+    if source == "cache":
+        return jsonify(build_cached_response({**history_entry, "data": payload}, source)), 200
+    return jsonify({"data": payload, "source": source, "cached_at": None})
+
+
+@app.route("/api/export/history", methods=["GET"])
+def export_history():
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_WRITERS:
+        supported = ", ".join(EXPORT_WRITERS)
+        return jsonify({"error": f"Unsupported format {export_format}. Use: {supported}."}), 400
+    bounds = {}
+    for name in ("start", "end"):
+        raw = request.args.get(name)
+        try:
+            bounds[name] = int(raw) if raw is not None else None
+        except ValueError:
+            return jsonify({"error": f"{name} must be an integer timestamp in ms."}), 400
+    start, end = bounds["start"], bounds["end"]
+
+    requested = request.args.get("coins")
+    if requested:
+        coin_ids = list(dict.fromkeys(coin_id for coin_id in requested.split(",") if coin_id))
+        if len(coin_ids) > EXPORT_MAX_COINS:
+            return jsonify({"error": f"At most {EXPORT_MAX_COINS} coins per export."}), 400
+    else:
+        coin_ids = list(cache["history"])
+    for coin_id in coin_ids:
+        if coin_id in cache["history"]:
+            continue
+        try:
+            fetch_crypto_history(coin_id)
+        except RequestException:
+            return jsonify({"error": f"Unable to fetch price history for {coin_id}."}), 502
+
+    writer = EXPORT_WRITERS[export_format]
+    return Response(
+        writer(_export_points(coin_ids, start, end)),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=history.{export_format}",
+        },
+    )
+
+
+@app.route("/api/providers", methods=["GET"])
+def get_provider_stats():
+    return jsonify(
+        {
+            "data": [
+                {
+                    "name": provider.name,
+                    "hedge_delay": provider.latency.hedge_delay(provider.timeout),
+                    **provider.latency.snapshot(),
+                }
+                for provider in market_providers
+            ]
+        }
+    )
+
+
+@app.route("/api/debug/slow-requests", methods=["GET"])
+def get_slow_requests():
+    if not app.config.get("DEBUG_ENDPOINTS_ENABLED"):
+        abort(404)
+    return jsonify(
+        {
+            "data": list(reversed(slow_requests)),
+            "threshold_ms": app.config.get("SLOW_REQUEST_THRESHOLD_MS"),
+        }
+    )
+
+
+@app.route("/api/debug/profiles", methods=["GET"])
+def list_profiles():
+    if not app.config.get("PROFILING_ENABLED"):
+        abort(404)
+    summaries = [
+        {key: value for key, value in profile.items() if key != "stats"}
+        for profile in reversed(request_profiles)
+    ]
+    return jsonify({"data": summaries})
+
+
+@app.route("/api/debug/profiles/<int:profile_id>", methods=["GET"])
+def get_profile(profile_id: int):
+    if not app.config.get("PROFILING_ENABLED"):
+        abort(404)
+    for profile in request_profiles:
+        if profile["id"] == profile_id:
+            return Response(profile["stats"], mimetype="text/plain")
+    return jsonify({"error": f"Profile {profile_id} not found."}), 404
+
+
+@app.route("/api/alerts", methods=["GET"])
+def list_alerts():
+    with alert_lock:
+        rules = list(alerts["rules"].values())
+    return jsonify({"data": rules})
+
+
+@app.route("/api/alerts", methods=["POST"])
+def create_alert():
+    body = request.get_json(silent=True) or {}
+    coin_id = body.get("coin_id")
+    direction = body.get("direction")
+    threshold = body.get("threshold")
+    if not coin_id or direction not in ALERT_DIRECTIONS:
+        return jsonify({"error": "coin_id and direction (above/below) are required."}), 400
+    if (
+        isinstance(threshold, bool)
+        or not isinstance(threshold, (int, float))
+        or not math.isfinite(threshold)
+    ):
+        return jsonify({"error": "threshold must be a finite number."}), 400
+    return jsonify({"data": add_alert_rule(coin_id, direction, threshold)}), 201
+
+
+@app.route("/api/alerts/<int:rule_id>", methods=["DELETE"])
+def delete_alert(rule_id: int):
+    if not remove_alert_rule(rule_id):
+        return jsonify({"error": f"Alert {rule_id} not found."}), 404
+    return "", 204
+
+
+@app.route("/api/alerts/triggered", methods=["GET"])
+def drain_triggered_alerts():
+    drained = []
+    while not triggered_alerts.empty():
+        drained.append(triggered_alerts.get_nowait())
+    return jsonify({"data": drained})
+
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,93 @@
+"""
+//
+//  bench_alerts.py
+//  CryptoTracker
+//
+//  Created by Cascade on Dec 14, 2025.
+//  Copyright © 2025 CryptoTracker. All rights reserved.
+//
+
+Compara la evaluación de alertas por bisección contra un recorrido lineal.
+
+Uso: python -m benchmarks.bench_alerts [--rules 100000] [--refreshes 200]
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from app import ALERT_DIRECTIONS, add_alert_rule, alert_sinks, alerts, evaluate_alerts
+
+COIN_COUNT = 10
+BASE_PRICE = 1_000.0
+
+
+def _market_snapshot(prices: Dict[str, float]) -> List[Dict[str, Any]]:
+    return [{"id": coin_id, "current_price": price} for coin_id, price in prices.items()]
+
+
+def _random_walk(rng: random.Random, prices: Dict[str, float]) -> Dict[str, float]:
+    return {
+        coin_id: max(1.0, price * (1 + rng.gauss(0, 0.01)))
+        for coin_id, price in prices.items()
+    }
+
+
+def _linear_scan(
+    rules: List[Dict[str, Any]], previous: Dict[str, float], current: Dict[str, float]
+) -> List[Dict[str, Any]]:
+    pending = []
+    for rule in rules:
+        before, after = previous[rule["coin_id"]], current[rule["coin_id"]]
+        crossed_up = rule["direction"] == "above" and before < rule["threshold"] <= after
+        crossed_down = rule["direction"] == "below" and after <= rule["threshold"] < before
+        if not (crossed_up or crossed_down):
+            pending.append(rule)
+    return pending
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--refreshes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    coins = [f"coin-{index}" for index in range(COIN_COUNT)]
+    alert_sinks.clear()
+
+    started = time.perf_counter()
+    for _ in range(args.rules):
+        add_alert_rule(
+            rng.choice(coins),
+            rng.choice(ALERT_DIRECTIONS),
+            BASE_PRICE * rng.uniform(0.5, 1.5),
+        )
+    insert_seconds = time.perf_counter() - started
+    rules = list(alerts["rules"].values())
+
+    walk = [{coin_id: BASE_PRICE for coin_id in coins}]
+    for _ in range(args.refreshes):
+        walk.append(_random_walk(rng, walk[-1]))
+
+    started = time.perf_counter()
+    fired_bisect = sum(len(evaluate_alerts(_market_snapshot(prices))) for prices in walk)
+    bisect_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pending = rules
+    for previous, current in zip(walk, walk[1:]):
+        pending = _linear_scan(pending, previous, current)
+    scan_seconds = time.perf_counter() - started
+    assert len(rules) - len(pending) == fired_bisect
+
+    print(f"rules={args.rules} refreshes={args.refreshes} fired={fired_bisect}")
+    print(f"insert:          {insert_seconds * 1000:10.2f} ms total")
+    print(f"sorted index:    {bisect_seconds / len(walk) * 1000:10.3f} ms/refresh")
+    print(f"linear scan:     {scan_seconds / args.refreshes * 1000:10.3f} ms/refresh")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+//
+//  bench_projection.py
+//  CryptoTracker
+//
+//  Created by Cascade on Dec 14, 2025.
+//  Copyright © 2025 CryptoTracker. All rights reserved.
+//
+
+Micro-benchmarks de sanitización y proyección de campos del mercado.
+
+Uso: python -m benchmarks.bench_projection [--entries 10000] [--repeat 20]
+"""
+
+import argparse
+import json
+import timeit
+from typing import Any, Callable, Dict, List
+
+from app import MARKET_FIELDS, compile_projector, project_entries
+
+
+def _legacy_sanitize(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    fields = [
+        "id",
+        "symbol",
+        "name",
+        "current_price",
+        "price_change_percentage_24h",
+        "market_cap",
+        "image",
+        "total_volume",
+    ]
+    return [{field: entry.get(field) for field in fields} for entry in entries]
+
+
+def _market_sanitize(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    project = compile_projector(MARKET_FIELDS)
+    return [project(entry) for entry in entries]
+
+
+def _build_entries(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"coin-{index}",
+            "symbol": f"c{index}",
+            "name": f"Coin {index}",
+            "current_price": 1000.0 + index,
+            "price_change_percentage_24h": index / 100,
+            "market_cap": 1_000_000 * index,
+            "image": f"https://cdn.example.com/coin-{index}.png",
+            "total_volume": 10_000 * index,
+            "ath": 2000.0 + index,
+            "roi": None,
+        }
+        for index in range(count)
+    ]
+
+
+def _report(label: str, func: Callable[[], Any], repeat: int) -> float:
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<40}{best * 1000:10.2f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    raw = _build_entries(args.entries)
+    sanitized = _market_sanitize(raw)
+    narrow = ("id", "current_price")
+
+    print(f"entries={args.entries} (best of {args.repeat})")
+    legacy = _report("sanitize: dict comprehension", lambda: _legacy_sanitize(raw), args.repeat)
+    market = _report("sanitize: market projector  ", lambda: _market_sanitize(raw), args.repeat)
+    full = _report(
+        "serialize: all fields",
+        lambda: json.dumps(project_entries(sanitized, None)),
+        args.repeat,
+    )
+    projected = _report(
+        "project + serialize: id,current_price",
+        lambda: json.dumps(project_entries(sanitized, narrow)),
+        args.repeat,
+    )
+    print(f"sanitize speedup:  {legacy / market:5.2f}x")
+    print(f"projection speedup:{full / projected:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
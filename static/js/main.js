@@ -12,6 +12,10 @@ const API_ROUTES = {
 };
 
 const REFRESH_INTERVAL_MS = 60000;
+const SERVICE_WORKER_URL = "/sw.js";
+const SPARKLINE_SIZE = { width: 120, height: 36 };
+const VIRTUALIZE_MIN_ROWS = 60;
+const VIRTUAL_OVERSCAN_ROWS = 10;
 
 const formatters = {
   price: (value) => {
@@ -47,6 +51,11 @@ const state = {
   refreshTimer: null,
   priceMap: new Map(),
   chart: null,
+  rows: new Map(),
+  coinIndex: new Map(),
+  searchKeys: new Map(),
+  rowHeight: null,
+  renderFrame: null,
 };
 
 const elements = {
@@ -71,6 +80,8 @@ const createSpinner = () => {
 
 const setGridContent = (content) => {
   elements.grid.innerHTML = "";
+  elements.grid.style.paddingTop = "";
+  elements.grid.style.paddingBottom = "";
   if (content instanceof HTMLElement) {
     elements.grid.appendChild(content);
     return;
@@ -98,12 +109,65 @@ const animatePriceChange = (row, previous, current) => {
   );
 };
 
-const buildRow = (coin, index) => {
+const buildSparkline = (points) => {
+  if (!points || points.length < 2) {
+    return "";
+  }
+  const { width, height } = SPARKLINE_SIZE;
+  const min = Math.min(...points);
+  const max = Math.max(...points);
+  const range = max - min || 1;
+  const stepX = width / (points.length - 1);
+  const path = points
+    .map((value, index) => {
+      const x = (index * stepX).toFixed(1);
+      const y = (height - ((value - min) / range) * height).toFixed(1);
+      return `${x},${y}`;
+    })
+    .join(" ");
+  const trendClass =
+    points[points.length - 1] >= points[0] ? "value-positive" : "value-negative";
+  return `
+    <svg class="sparkline ${trendClass}" viewBox="0 0 ${width} ${height}"
+      preserveAspectRatio="none" aria-hidden="true">
+      <polyline points="${path}" />
+    </svg>
+  `;
+};
+
+const setCellText = (cell, text) => {
+  if (cell.textContent !== text) {
+    cell.textContent = text;
+  }
+};
+
+const patchRow = (row, coin, index) => {
+  const cells = row.fieldCells;
+  setCellText(cells.rank, String(index + 1));
+  setCellText(cells.price, formatters.price(coin.current_price));
+  setCellText(cells.change, formatters.percent(coin.price_change_percentage_24h));
+  cells.change.className =
+    coin.price_change_percentage_24h >= 0 ? "value-positive" : "value-negative";
+  setCellText(cells.marketCap, formatters.marketCap(coin.market_cap));
+  setCellText(cells.volume, formatters.volume(coin.total_volume));
+  const sparklineKey = coin.sparkline ? coin.sparkline.join(",") : "";
+  if (row.sparklineKey !== sparklineKey) {
+    cells.sparkline.innerHTML = buildSparkline(coin.sparkline);
+    row.sparklineKey = sparklineKey;
+  }
+  const previousPrice = state.priceMap.get(coin.id);
+  if (row.isConnected) {
+    animatePriceChange(row, previousPrice, coin.current_price);
+  }
+  state.priceMap.set(coin.id, coin.current_price);
+};
+
+const buildRow = (coin) => {
   const row = document.createElement("div");
   row.className = "table-row fade-in";
   row.dataset.coinId = coin.id;
   row.innerHTML = `
-    <span>${index + 1}</span>
+    <span data-field="rank"></span>
     <span class="crypto-name">
       <img src="${coin.image}" alt="${coin.name}" loading="lazy" />
       <span>
@@ -111,49 +175,129 @@ const buildRow = (coin, index) => {
         <small>${coin.symbol.toUpperCase()}</small>
       </span>
     </span>
-    <span data-field="price">${formatters.price(coin.current_price)}</span>
-    <span class="${
-      coin.price_change_percentage_24h >= 0 ? "value-positive" : "value-negative"
-    }">${formatters.percent(coin.price_change_percentage_24h)}</span>
-    <span>${
-      formatters.marketCap(coin.market_cap)
-    }</span>
-    <span>${formatters.volume(coin.total_volume)}</span>
+    <span data-field="price"></span>
+    <span data-field="change"></span>
+    <span data-field="marketCap"></span>
+    <span data-field="volume"></span>
+    <span data-field="sparkline"></span>
   `;
-  row.addEventListener("click", () => handleCoinSelection(coin));
-  const previousPrice = state.priceMap.get(coin.id);
-  animatePriceChange(row, previousPrice, coin.current_price);
-  state.priceMap.set(coin.id, coin.current_price);
+  row.fieldCells = {};
+  row.querySelectorAll("[data-field]").forEach((cell) => {
+    row.fieldCells[cell.dataset.field] = cell;
+  });
+  row.addEventListener("animationend", () => row.classList.remove("fade-in"), {
+    once: true,
+  });
   return row;
 };
 
+const getVisibleRange = (total) => {
+  if (total <= VIRTUALIZE_MIN_ROWS) {
+    return [0, total];
+  }
+  if (!state.rowHeight) {
+    return [0, Math.min(total, VIRTUAL_OVERSCAN_ROWS)];
+  }
+  const gridTop = elements.grid.getBoundingClientRect().top;
+  const first = Math.floor(-gridTop / state.rowHeight) - VIRTUAL_OVERSCAN_ROWS;
+  const last =
+    Math.ceil((window.innerHeight - gridTop) / state.rowHeight) + VIRTUAL_OVERSCAN_ROWS;
+  return [Math.max(0, Math.min(first, total)), Math.max(0, Math.min(last, total))];
+};
+
 const renderCryptoList = () => {
-  if (!state.filtered.length) {
+  const total = state.filtered.length;
+  if (!total) {
     setGridContent("No se encontraron criptomonedas.");
     return;
   }
-  elements.grid.innerHTML = "";
-  const fragment = document.createDocumentFragment();
-  state.filtered.forEach((coin, index) => {
-    fragment.appendChild(buildRow(coin, index));
+  const [start, end] = getVisibleRange(total);
+  const visibleCoins = state.filtered.slice(start, end);
+  const visibleIds = new Set(visibleCoins.map((coin) => coin.id));
+  let cursor = elements.grid.firstElementChild;
+
+  visibleCoins.forEach((coin, offset) => {
+    while (cursor && !visibleIds.has(cursor.dataset.coinId)) {
+      const stale = cursor;
+      cursor = cursor.nextElementSibling;
+      stale.remove();
+    }
+    let row = state.rows.get(coin.id);
+    if (!row) {
+      row = buildRow(coin);
+      state.rows.set(coin.id, row);
+    }
+    patchRow(row, coin, start + offset);
+    if (row === cursor) {
+      cursor = cursor.nextElementSibling;
+    } else {
+      elements.grid.insertBefore(row, cursor);
+    }
+  });
+  while (cursor) {
+    const stale = cursor;
+    cursor = cursor.nextElementSibling;
+    stale.remove();
+  }
+
+  if (total > VIRTUALIZE_MIN_ROWS && !state.rowHeight) {
+    state.rowHeight = elements.grid.firstElementChild.offsetHeight || null;
+    if (state.rowHeight) {
+      renderCryptoList();
+      return;
+    }
+  }
+  const rowHeight = total > VIRTUALIZE_MIN_ROWS ? state.rowHeight || 0 : 0;
+  elements.grid.style.paddingTop = `${start * rowHeight}px`;
+  elements.grid.style.paddingBottom = `${(total - end) * rowHeight}px`;
+};
+
+const measureRender = (name, action) => {
+  performance.mark(`${name}:start`);
+  action();
+  performance.clearMeasures(name);
+  performance.measure(name, `${name}:start`);
+  performance.clearMarks(`${name}:start`);
+};
+
+const scheduleRender = () => {
+  if (state.renderFrame || state.filtered.length <= VIRTUALIZE_MIN_ROWS) {
+    return;
+  }
+  state.renderFrame = requestAnimationFrame(() => {
+    state.renderFrame = null;
+    measureRender("crypto-grid:scroll", renderCryptoList);
   });
-  elements.grid.appendChild(fragment);
 };
 
 const filterCryptos = () => {
   const query = elements.searchInput.value.trim().toLowerCase();
   if (!query) {
-    state.filtered = [...state.cryptos];
+    state.filtered = state.cryptos;
   } else {
-    state.filtered = state.cryptos.filter(
-      (coin) =>
-        coin.name.toLowerCase().includes(query) ||
-        coin.symbol.toLowerCase().includes(query)
+    state.filtered = state.cryptos.filter((coin) =>
+      state.searchKeys.get(coin.id).includes(query)
     );
   }
   renderCryptoList();
 };
 
+const indexCryptos = (cryptos) => {
+  state.coinIndex = new Map(cryptos.map((coin) => [coin.id, coin]));
+  state.searchKeys = new Map(
+    cryptos.map((coin) => [
+      coin.id,
+      `${coin.name.toLowerCase()}\u0000${coin.symbol.toLowerCase()}`,
+    ])
+  );
+  state.rows.forEach((row, coinId) => {
+    if (!state.coinIndex.has(coinId)) {
+      row.remove();
+      state.rows.delete(coinId);
+    }
+  });
+};
+
 const fetchJSON = async (url) => {
   const response = await fetch(url);
   if (!response.ok) {
@@ -162,14 +306,21 @@ const fetchJSON = async (url) => {
   return response.json();
 };
 
+const applyCryptos = (payload) => {
+  measureRender("crypto-grid:apply", () => {
+    state.cryptos = payload.data || [];
+    indexCryptos(state.cryptos);
+    filterCryptos();
+  });
+};
+
 const loadCryptos = async ({ showLoader = true } = {}) => {
-  if (showLoader) {
+  // Existing rows stay in place so a refresh patches them and flashes price changes
+  if (showLoader && !state.rows.size) {
     setGridContent(createSpinner());
   }
   try {
-    const payload = await fetchJSON(API_ROUTES.LIST);
-    state.cryptos = payload.data || [];
-    filterCryptos();
+    applyCryptos(await fetchJSON(API_ROUTES.LIST));
   } catch (error) {
     if (!state.cryptos.length) {
       setGridContent("No pudimos cargar los datos. Intenta nuevamente.");
@@ -302,9 +453,45 @@ const handleCoinSelection = (coin) => {
   loadCoinHistory(coin);
 };
 
+const handleServiceWorkerMessage = (event) => {
+  const { type, url, payload } = event.data || {};
+  if (type !== "api-updated" || !payload) {
+    return;
+  }
+  if (url === API_ROUTES.LIST) {
+    applyCryptos(payload);
+    return;
+  }
+  const coin = state.selectedCoin;
+  const isChartOpen = !elements.chartPanel.classList.contains("hidden");
+  if (coin && isChartOpen && url === API_ROUTES.HISTORY(coin.id)) {
+    updateChart(coin, payload.data?.prices || []);
+  }
+};
+
+const registerServiceWorker = () => {
+  if (!("serviceWorker" in navigator)) {
+    return;
+  }
+  navigator.serviceWorker.addEventListener("message", handleServiceWorkerMessage);
+  navigator.serviceWorker.register(SERVICE_WORKER_URL, { scope: "/" }).catch(() => {});
+};
+
 const registerEvents = () => {
   elements.searchForm.addEventListener("submit", (event) => event.preventDefault());
   elements.searchInput.addEventListener("input", filterCryptos);
+  elements.grid.addEventListener("click", (event) => {
+    const row = event.target.closest("[data-coin-id]");
+    const coin = row && state.coinIndex.get(row.dataset.coinId);
+    if (coin) {
+      handleCoinSelection(coin);
+    }
+  });
+  window.addEventListener("scroll", scheduleRender, { passive: true });
+  window.addEventListener("resize", () => {
+    state.rowHeight = null;
+    scheduleRender();
+  });
   elements.refreshButton.addEventListener("click", () => loadCryptos({ showLoader: true }));
   elements.closeModal.addEventListener("click", hideModal);
   elements.modalOverlay.addEventListener("click", (event) => {
@@ -326,7 +513,7 @@ const startAutoRefresh = () => {
 
 const init = () => {
   registerEvents();
-  loadCryptos();
+  loadCryptos().finally(registerServiceWorker);
   startAutoRefresh();
 };
 
@@ -0,0 +1,182 @@
+//
+//  sw.js
+//  CryptoTracker
+//
+//  Created by Cascade on Dec 14, 2025.
+//  Copyright © 2025 CryptoTracker. All rights reserved.
+//
+
+const DB_NAME = "cryptotracker";
+const DB_VERSION = 1;
+const STORE_NAME = "responses";
+const LIST_PATH = "/api/cryptos";
+const HISTORY_PATTERN = /^\/api\/crypto\/[^/]+\/history$/;
+const REVALIDATE_AFTER_MS = 15000;
+const HISTORY_LIMITS = { entries: 25, bytes: 2 * 1024 * 1024 };
+
+const openDatabase = () =>
+  new Promise((resolve, reject) => {
+    const request = indexedDB.open(DB_NAME, DB_VERSION);
+    request.onupgradeneeded = () => {
+      const store = request.result.createObjectStore(STORE_NAME, { keyPath: "url" });
+      store.createIndex("accessedAt", "accessedAt");
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+let databasePromise = null;
+
+const getDatabase = () => {
+  if (!databasePromise) {
+    databasePromise = openDatabase().catch((error) => {
+      databasePromise = null;
+      throw error;
+    });
+  }
+  return databasePromise;
+};
+
+const runTransaction = async (mode, action) => {
+  const database = await getDatabase();
+  return new Promise((resolve, reject) => {
+    const transaction = database.transaction(STORE_NAME, mode);
+    const pendingRequest = action(transaction.objectStore(STORE_NAME));
+    transaction.oncomplete = () => resolve(pendingRequest.result);
+    transaction.onerror = () => reject(transaction.error);
+  });
+};
+
+const readEntry = (url) => runTransaction("readonly", (store) => store.get(url));
+
+const writeEntry = (entry) => runTransaction("readwrite", (store) => store.put(entry));
+
+const evictHistories = () =>
+  runTransaction("readwrite", (store) => {
+    let keptEntries = 0;
+    let keptBytes = 0;
+    const cursorRequest = store.index("accessedAt").openCursor(null, "prev");
+    cursorRequest.onsuccess = () => {
+      const cursor = cursorRequest.result;
+      if (!cursor) {
+        return;
+      }
+      const { kind, size } = cursor.value;
+      if (kind === "history") {
+        const fits =
+          keptEntries < HISTORY_LIMITS.entries && keptBytes + size <= HISTORY_LIMITS.bytes;
+        if (fits) {
+          keptEntries += 1;
+          keptBytes += size;
+        } else {
+          cursor.delete();
+        }
+      }
+      cursor.continue();
+    };
+    return cursorRequest;
+  });
+
+const classify = (url) => {
+  if (url.pathname === LIST_PATH && !url.search) {
+    return "list";
+  }
+  if (HISTORY_PATTERN.test(url.pathname)) {
+    return "history";
+  }
+  return null;
+};
+
+const buildResponse = (entry) =>
+  new Response(entry.body, {
+    status: 200,
+    headers: {
+      "Content-Type": "application/json",
+      ETag: entry.etag || "",
+      "X-Served-By": "service-worker",
+    },
+  });
+
+const storeResponse = async (url, kind, response) => {
+  const body = await response.text();
+  const now = Date.now();
+  await writeEntry({
+    url,
+    kind,
+    body,
+    etag: response.headers.get("ETag"),
+    size: body.length,
+    storedAt: now,
+    validatedAt: now,
+    accessedAt: now,
+  });
+  if (kind === "history") {
+    await evictHistories();
+  }
+  return body;
+};
+
+const notifyClients = async (url, body) => {
+  const clients = await self.clients.matchAll({ type: "window" });
+  const payload = JSON.parse(body);
+  clients.forEach((client) => client.postMessage({ type: "api-updated", url, payload }));
+};
+
+const revalidate = async (url, kind, entry) => {
+  const headers = entry.etag ? { "If-None-Match": entry.etag } : {};
+  try {
+    const response = await fetch(url, { headers, cache: "no-store" });
+    if (response.status === 304) {
+      await writeEntry({ ...entry, validatedAt: Date.now() });
+      return;
+    }
+    if (response.ok) {
+      const body = await storeResponse(url, kind, response);
+      if (body !== entry.body) {
+        await notifyClients(url, body);
+      }
+    }
+  } catch (error) {
+    // Sin red: se conserva la última copia conocida.
+  }
+};
+
+const handleApiRequest = async (event, url, kind) => {
+  const key = url.pathname;
+  const entry = await readEntry(key).catch(() => undefined);
+  if (!entry) {
+    const response = await fetch(event.request);
+    if (response.ok) {
+      await storeResponse(key, kind, response.clone()).catch(() => undefined);
+    }
+    return response;
+  }
+  const now = Date.now();
+  const touched = { ...entry, accessedAt: now };
+  const pending = writeEntry(touched).then(() => {
+    if (now - entry.validatedAt > REVALIDATE_AFTER_MS) {
+      return revalidate(key, kind, touched);
+    }
+    return undefined;
+  });
+  event.waitUntil(pending.catch(() => undefined));
+  return buildResponse(entry);
+};
+
+self.addEventListener("install", () => self.skipWaiting());
+
+self.addEventListener("activate", (event) => event.waitUntil(self.clients.claim()));
+
+self.addEventListener("fetch", (event) => {
+  if (event.request.method !== "GET") {
+    return;
+  }
+  const url = new URL(event.request.url);
+  const kind = url.origin === self.location.origin ? classify(url) : null;
+  if (!kind) {
+    return;
+  }
+  event.respondWith(
+    handleApiRequest(event, url, kind).catch(() => fetch(event.request))
+  );
+});
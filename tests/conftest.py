@@ -20,8 +20,11 @@ from app import (
     COINGECKO_MARKETS_URL,
     HISTORY_DAYS,
     VS_CURRENCY,
+    alert_deliveries,
+    alerts,
     app as flask_app,
     cache,
+    triggered_alerts,
 )
 
 
@@ -102,6 +105,19 @@ def mock_coingecko(
 def reset_cache_state():
     cache["cryptos"] = {"data": None, "timestamp": None}
     cache["history"] = {}
+    cache["ohlc"] = {}
     yield
     cache["cryptos"] = {"data": None, "timestamp": None}
     cache["history"] = {}
+    cache["ohlc"] = {}
+
+
+@pytest.fixture(autouse=True)
+def reset_alert_state():
+    yield
+    alert_deliveries.join()
+    alerts["rules"] = {}
+    alerts["index"] = {}
+    alerts["last_prices"] = {}
+    while not triggered_alerts.empty():
+        triggered_alerts.get_nowait()
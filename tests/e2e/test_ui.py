@@ -9,9 +9,10 @@
 """
 
 import asyncio
+import json
 import os
 from pathlib import Path
-from typing import Awaitable, Callable, Dict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import pytest
 from playwright.async_api import Page, async_playwright, expect
@@ -21,6 +22,7 @@ DESKTOP_VIEWPORT: Dict[str, int] = {"width": 1400, "height": 900}
 MOBILE_VIEWPORT: Dict[str, int] = {"width": 390, "height": 844}
 DATA_TIMEOUT_MS = 20000
 SCREENSHOT_DIR = Path(__file__).parent / "artifacts"
+BENCHMARK_COIN_COUNT = 1000
 
 
 def _get_base_url() -> str:
@@ -32,15 +34,19 @@ async def run_ui_flow(
     steps: Callable[[Page], Awaitable[None]],
     *,
     viewport: Dict[str, int] = DESKTOP_VIEWPORT,
+    setup: Optional[Callable[[Page], Awaitable[None]]] = None,
+    service_workers: str = "allow",
 ) -> None:
     async with async_playwright() as playwright:
         base_url = _get_base_url()
         if not base_url:
             raise RuntimeError("E2E_BASE_URL no está configurado.")
         browser = await playwright.chromium.launch(headless=True)
-        context = await browser.new_context(viewport=viewport)
+        context = await browser.new_context(viewport=viewport, service_workers=service_workers)
         page = await context.new_page()
         try:
+            if setup:
+                await setup(page)
             await page.goto(base_url, wait_until="networkidle")
             await steps(page)
         except Exception:
@@ -63,8 +69,35 @@ def run_async_test(
     steps: Callable[[Page], Awaitable[None]],
     *,
     viewport: Dict[str, int] = DESKTOP_VIEWPORT,
+    setup: Optional[Callable[[Page], Awaitable[None]]] = None,
+    service_workers: str = "allow",
 ) -> None:
-    asyncio.run(run_ui_flow(test_name, steps, viewport=viewport))
+    asyncio.run(
+        run_ui_flow(
+            test_name,
+            steps,
+            viewport=viewport,
+            setup=setup,
+            service_workers=service_workers,
+        )
+    )
+
+
+def _build_market_payload(count: int, price_factor: float = 1.0) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"bench-coin-{index}",
+            "symbol": f"bc{index}",
+            "name": f"Bench Coin {index}",
+            "current_price": round((100 + index) * price_factor, 2),
+            "price_change_percentage_24h": (-1) ** index * 1.5,
+            "market_cap": 1_000_000_000 + index,
+            "image": "data:image/gif;base64,R0lGODlhAQABAAAAACw=",
+            "total_volume": 10_000_000 + index,
+            "sparkline": [100 + index + step % 5 for step in range(24)],
+        }
+        for index in range(count)
+    ]
 
 
 @pytest.mark.e2e
@@ -168,3 +201,116 @@ def test_responsive_mobile(live_server):
         scenario,
         viewport=MOBILE_VIEWPORT,
     )
+
+
+@pytest.mark.e2e
+def test_service_worker_cache_miss_and_hit(live_server):
+    async def scenario(page: Page) -> None:
+        await page.wait_for_function(
+            "() => navigator.serviceWorker && navigator.serviceWorker.controller",
+            timeout=DATA_TIMEOUT_MS,
+        )
+        results = await page.evaluate(
+            """async () => {
+                const read = async () => {
+                    const response = await fetch("/api/crypto/bitcoin/history");
+                    return {
+                        status: response.status,
+                        servedBy: response.headers.get("X-Served-By"),
+                        body: await response.json(),
+                    };
+                };
+                const miss = await read();
+                const hit = await read();
+                return { miss, hit };
+            }"""
+        )
+        # El primer acceso no está en IndexedDB: debe ir a la red y devolver JSON válido
+        assert results["miss"]["status"] == 200
+        assert results["miss"]["servedBy"] is None
+        assert results["miss"]["body"]["data"]["id"] == "bitcoin"
+        # El segundo acceso se sirve desde la copia guardada en el fallo anterior
+        assert results["hit"]["servedBy"] == "service-worker"
+        assert results["hit"]["body"] == results["miss"]["body"]
+
+    run_async_test("test_service_worker_cache_miss_and_hit", scenario)
+
+
+async def _wait_for_measure(page: Page, name: str, since: float) -> float:
+    """Espera la medición ``name`` registrada por main.js después de ``since``."""
+    handle = await page.wait_for_function(
+        """([name, since]) => {
+            const entry = performance.getEntriesByName(name, "measure").at(-1);
+            return entry && entry.startTime > since ? entry.duration : null;
+        }""",
+        arg=[name, since],
+        timeout=DATA_TIMEOUT_MS,
+    )
+    return await handle.json_value()
+
+
+@pytest.mark.e2e
+def test_render_benchmark_1000_coins(live_server, record_property):
+    payloads = [
+        json.dumps(
+            {
+                "data": _build_market_payload(BENCHMARK_COIN_COUNT, price_factor),
+                "source": "live",
+                "cached_at": None,
+            }
+        )
+        for price_factor in (1.0, 1.01)
+    ]
+    served: List[str] = []
+
+    async def fulfill(route) -> None:
+        body = payloads[min(len(served), len(payloads) - 1)]
+        served.append(body)
+        await route.fulfill(status=200, content_type="application/json", body=body)
+
+    async def setup(page: Page) -> None:
+        await page.route("**/api/cryptos", fulfill)
+
+    async def scenario(page: Page) -> None:
+        rows = page.locator("#cryptoGrid .table-row")
+        await expect(rows.first).to_be_visible(timeout=DATA_TIMEOUT_MS)
+        timings = {"initial": await _wait_for_measure(page, "crypto-grid:apply", 0)}
+
+        since = await page.evaluate(
+            """() => {
+                window.benchmarkRow = document.querySelector("#cryptoGrid .table-row");
+                return performance.now();
+            }"""
+        )
+        await page.click("#refreshButton")
+        timings["refresh"] = await _wait_for_measure(page, "crypto-grid:apply", since)
+        # La actualización parchea la misma fila en su sitio y anima el cambio de precio
+        patched = await page.evaluate(
+            """() => ({
+                connected: window.benchmarkRow.isConnected,
+                animated: window.benchmarkRow.getAnimations().length > 0,
+            })"""
+        )
+        assert patched == {"connected": True, "animated": True}
+
+        since = await page.evaluate("() => performance.now()")
+        await page.mouse.wheel(0, 20000)
+        timings["scroll"] = await _wait_for_measure(page, "crypto-grid:scroll", since)
+
+        dom_rows = await rows.count()
+        for phase, duration in timings.items():
+            record_property(f"render_{phase}_ms", round(duration, 2))
+        print(f"render benchmark ({BENCHMARK_COIN_COUNT} coins, ms): {timings}")
+        assert dom_rows < BENCHMARK_COIN_COUNT / 10
+
+        await page.fill("#searchInput", "bench coin 999")
+        await expect(rows).to_have_count(1, timeout=DATA_TIMEOUT_MS)
+        await rows.first.click()
+        await expect(page.locator("#modalOverlay")).to_be_visible(timeout=DATA_TIMEOUT_MS)
+
+    run_async_test(
+        "test_render_benchmark_1000_coins",
+        scenario,
+        setup=setup,
+        service_workers="block",
+    )
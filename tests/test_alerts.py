@@ -0,0 +1,222 @@
+"""
+//
+//  test_alerts.py
+//  CryptoTracker
+//
+//  Created by Cascade on Dec 14, 2025.
+//  Copyright © 2025 CryptoTracker. All rights reserved.
+//
+"""
+
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+import responses
+
+from app import (
+    COINGECKO_MARKETS_URL,
+    add_alert_rule,
+    alert_deliveries,
+    alert_sinks,
+    alerts,
+    evaluate_alerts,
+    register_alert_sink,
+)
+
+
+def _market_entry(coin_id: str, price: float) -> Dict[str, Any]:
+    return {
+        "id": coin_id,
+        "symbol": coin_id[:3],
+        "name": coin_id.title(),
+        "current_price": price,
+        "price_change_percentage_24h": 0.0,
+        "market_cap": 1,
+        "image": "https://cdn.example.com/coin.png",
+        "total_volume": 1,
+    }
+
+
+def _refresh(client, prices: Dict[str, float]) -> None:
+    payload = [_market_entry(coin_id, price) for coin_id, price in prices.items()]
+    with responses.RequestsMock() as mocked:
+        mocked.add(responses.GET, COINGECKO_MARKETS_URL, json=payload, status=200)
+        assert client.get("/api/cryptos").status_code == 200
+    alert_deliveries.join()
+
+
+@pytest.fixture()
+def captured_alerts():
+    captured: List[Dict[str, Any]] = []
+    register_alert_sink(captured.append)
+    yield captured
+    alert_sinks.remove(captured.append)
+
+
+class TestAlertEvaluation:
+    """Evaluación de alertas de precio en cada refresco del mercado."""
+
+    @pytest.mark.unit
+    def test_alert_fires_when_price_crosses_above(self, client, captured_alerts):
+        # Una alerta "above" se dispara al cruzar el umbral hacia arriba
+        add_alert_rule("bitcoin", "above", 50_000)
+        _refresh(client, {"bitcoin": 49_000})
+        _refresh(client, {"bitcoin": 51_000})
+
+        assert len(captured_alerts) == 1
+        assert captured_alerts[0]["threshold"] == 50_000
+        assert captured_alerts[0]["previous_price"] == 49_000
+        assert captured_alerts[0]["price"] == 51_000
+
+    @pytest.mark.unit
+    def test_alert_fires_when_price_crosses_below(self, client, captured_alerts):
+        # Una alerta "below" se dispara al cruzar el umbral hacia abajo
+        add_alert_rule("bitcoin", "below", 40_000)
+        add_alert_rule("bitcoin", "above", 40_000)
+        _refresh(client, {"bitcoin": 41_000})
+        _refresh(client, {"bitcoin": 39_000})
+
+        assert [alert["direction"] for alert in captured_alerts] == ["below"]
+
+    @pytest.mark.unit
+    def test_only_crossed_thresholds_fire(self, client, captured_alerts):
+        # Solo se evalúan los umbrales entre el precio previo y el nuevo
+        for threshold in (100, 200, 300, 400):
+            add_alert_rule("ethereum", "above", threshold)
+        _refresh(client, {"ethereum": 150})
+        _refresh(client, {"ethereum": 300})
+
+        assert sorted(alert["threshold"] for alert in captured_alerts) == [200, 300]
+        assert [threshold for threshold, _ in alerts["index"]["ethereum"]["above"]] == [
+            100,
+            400,
+        ]
+
+    @pytest.mark.unit
+    def test_alert_fires_only_once(self, client, captured_alerts):
+        # Las alertas disparadas se eliminan y no se repiten
+        add_alert_rule("bitcoin", "above", 50_000)
+        _refresh(client, {"bitcoin": 49_000})
+        _refresh(client, {"bitcoin": 51_000})
+        _refresh(client, {"bitcoin": 49_000})
+        _refresh(client, {"bitcoin": 51_000})
+
+        assert len(captured_alerts) == 1
+        assert not alerts["rules"]
+
+    @pytest.mark.unit
+    def test_first_refresh_does_not_fire(self, captured_alerts):
+        # Sin precio previo no hay cruce que evaluar
+        add_alert_rule("bitcoin", "above", 10)
+        assert evaluate_alerts([_market_entry("bitcoin", 100)]) == []
+        alert_deliveries.join()
+        assert captured_alerts == []
+
+    @pytest.mark.unit
+    def test_slow_sink_does_not_block_refresh(self, client, captured_alerts):
+        # La entrega ocurre en segundo plano: un sink lento no retrasa /api/cryptos
+        release = threading.Event()
+
+        def slow_sink(alert: Dict[str, Any]) -> None:
+            release.wait(5)
+
+        alert_sinks.insert(0, slow_sink)
+        try:
+            add_alert_rule("bitcoin", "above", 50_000)
+            evaluate_alerts([_market_entry("bitcoin", 49_000)])
+            started = time.perf_counter()
+            fired = evaluate_alerts([_market_entry("bitcoin", 51_000)])
+            elapsed = time.perf_counter() - started
+            assert len(fired) == 1
+            assert elapsed < 1
+            assert captured_alerts == []
+        finally:
+            release.set()
+            alert_deliveries.join()
+            alert_sinks.remove(slow_sink)
+
+        assert len(captured_alerts) == 1
+
+    @pytest.mark.unit
+    def test_failing_sink_does_not_break_refresh(self, client, captured_alerts):
+        # Un sink con errores no impide entregar la alerta a los demás
+        def broken_sink(alert: Dict[str, Any]) -> None:
+            raise RuntimeError("sink down")
+
+        alert_sinks.insert(0, broken_sink)
+        try:
+            add_alert_rule("bitcoin", "above", 50_000)
+            _refresh(client, {"bitcoin": 49_000})
+            _refresh(client, {"bitcoin": 51_000})
+        finally:
+            alert_sinks.remove(broken_sink)
+
+        assert len(captured_alerts) == 1
+
+
+class TestAlertEndpoints:
+    """Pruebas para la API /api/alerts."""
+
+    @pytest.mark.unit
+    def test_create_and_list_alert(self, client):
+        # Una alerta creada aparece en el listado
+        response = client.post(
+            "/api/alerts",
+            json={"coin_id": "bitcoin", "direction": "above", "threshold": 50_000},
+        )
+        assert response.status_code == 201
+        rule = response.get_json()["data"]
+
+        listed = client.get("/api/alerts").get_json()["data"]
+        assert listed == [rule]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"direction": "above", "threshold": 1},
+            {"coin_id": "bitcoin", "direction": "sideways", "threshold": 1},
+            {"coin_id": "bitcoin", "direction": "above", "threshold": "1"},
+        ],
+    )
+    def test_create_alert_validation(self, client, body):
+        # Las peticiones incompletas o inválidas responden 400
+        response = client.post("/api/alerts", json=body)
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("threshold", ["NaN", "Infinity", "-Infinity"])
+    def test_non_finite_threshold_rejected(self, client, threshold):
+        # NaN o infinito corromperían el índice ordenado
+        response = client.post(
+            "/api/alerts",
+            data=f'{{"coin_id": "bitcoin", "direction": "above", "threshold": {threshold}}}',
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+        assert "bitcoin" not in alerts["index"]
+
+    @pytest.mark.unit
+    def test_delete_alert(self, client):
+        # Eliminar una alerta la quita del índice ordenado
+        rule = add_alert_rule("bitcoin", "below", 30_000)
+        add_alert_rule("bitcoin", "below", 30_000)
+
+        assert client.delete(f"/api/alerts/{rule['id']}").status_code == 204
+        assert client.delete(f"/api/alerts/{rule['id']}").status_code == 404
+        assert len(alerts["index"]["bitcoin"]["below"]) == 1
+        assert rule["id"] not in alerts["rules"]
+
+    @pytest.mark.unit
+    def test_triggered_alerts_are_drained_from_queue(self, client):
+        # El sink de cola en proceso expone las alertas disparadas
+        add_alert_rule("bitcoin", "above", 50_000)
+        _refresh(client, {"bitcoin": 49_000})
+        _refresh(client, {"bitcoin": 51_000})
+
+        drained = client.get("/api/alerts/triggered").get_json()["data"]
+        assert [alert["coin_id"] for alert in drained] == ["bitcoin"]
+        assert client.get("/api/alerts/triggered").get_json()["data"] == []
@@ -8,6 +8,7 @@
 //
 """
 
+import json
 from datetime import UTC, datetime, timedelta
 from typing import Any, Dict, List
 
@@ -19,9 +20,14 @@ from responses import matchers
 from app import (
     COINGECKO_HISTORY_URL,
     COINGECKO_MARKETS_URL,
+    EXPORT_MAX_COINS,
     HISTORY_DAYS,
+    MARKET_FIELDS,
+    SPARKLINE_POINTS,
     VS_CURRENCY,
     cache,
+    compile_projector,
+    downsample_series,
 )
 
 REQUIRED_FIELDS = [
@@ -191,6 +197,174 @@ class TestGetCryptosEndpoint:
         assert cache["cryptos"]["data"] == payload[:10]
 
 
+class TestResponseValidators:
+    """Validadores HTTP usados por el service worker para revalidar."""
+
+    @pytest.mark.unit
+    def test_cryptos_returns_etag_and_304(self, client):
+        # Un If-None-Match vigente responde 304 sin cuerpo
+        payload = _generate_market_payload()
+        with responses.RequestsMock() as mocked:
+            _register_market_response(mocked, payload)
+            _register_market_response(mocked, payload)
+            first = client.get("/api/cryptos")
+            second = client.get("/api/cryptos", headers={"If-None-Match": first.headers["ETag"]})
+
+        assert first.headers["ETag"]
+        assert second.status_code == 304
+        assert second.get_data() == b""
+
+    @pytest.mark.unit
+    def test_history_etag_changes_with_data(self, client):
+        # Un cambio en los datos produce un ETag distinto y respuesta completa
+        first_payload = _generate_history_payload("bitcoin")
+        updated_payload = {**first_payload, "prices": first_payload["prices"][1:]}
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, "bitcoin", first_payload)
+            first = client.get("/api/crypto/bitcoin/history")
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, "bitcoin", updated_payload)
+            second = client.get(
+                "/api/crypto/bitcoin/history",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+
+        assert second.status_code == 200
+        assert second.headers["ETag"] != first.headers["ETag"]
+
+    @pytest.mark.unit
+    def test_service_worker_served_with_root_scope(self, client):
+        # El service worker se sirve desde la raíz para controlar /api/*
+        response = client.get("/sw.js")
+
+        assert response.status_code == 200
+        assert "javascript" in response.content_type
+        assert response.headers["Service-Worker-Allowed"] == "/"
+        assert response.headers["Cache-Control"] == "no-cache"
+        response.close()
+
+
+class TestFieldProjection:
+    """Pruebas del parámetro ?fields= en /api/cryptos."""
+
+    @pytest.mark.unit
+    def test_fields_projection_live(self, client):
+        # Solo se devuelven los campos solicitados, en el orden pedido
+        payload = _generate_market_payload()
+        with responses.RequestsMock() as mocked:
+            _register_market_response(mocked, payload)
+            response = client.get("/api/cryptos?fields=id,current_price")
+
+        data = response.get_json()["data"]
+        assert response.status_code == 200
+        assert data == [
+            {"id": item["id"], "current_price": item["current_price"]} for item in payload
+        ]
+        assert cache["cryptos"]["data"][0].keys() == set(REQUIRED_FIELDS) | {"total_volume"}
+
+    @pytest.mark.unit
+    def test_fields_projection_cache_fallback(self, client):
+        # La proyección también se aplica a la respuesta desde caché
+        with responses.RequestsMock() as mocked:
+            _register_market_response(mocked, _generate_market_payload())
+            client.get("/api/cryptos")
+
+        with responses.RequestsMock() as mocked:
+            _register_market_response(mocked, [], status=500)
+            response = client.get("/api/cryptos?fields=symbol")
+
+        body = response.get_json()
+        assert body["source"] == "cache"
+        assert all(entry.keys() == {"symbol"} for entry in body["data"])
+
+    @pytest.mark.unit
+    def test_fields_projection_unknown_field(self, client):
+        # Un campo desconocido responde 400 sin consultar CoinGecko
+        response = client.get("/api/cryptos?fields=id,password")
+        assert response.status_code == 400
+        assert "password" in response.get_json()["error"]
+
+    @pytest.mark.unit
+    def test_projector_is_cached_per_field_set(self):
+        # Los proyectores compilados se reutilizan por conjunto de campos
+        project = compile_projector(("id", "current_price"))
+        assert compile_projector(("id", "current_price")) is project
+        assert project({"id": "btc"}) == {"id": "btc", "current_price": None}
+
+    @pytest.mark.unit
+    def test_market_projector_matches_market_fields(self):
+        # El proyector especializado copia exactamente MARKET_FIELDS y en el mismo orden
+        entry = {field: index for index, field in enumerate(MARKET_FIELDS)}
+        entry["ath"] = 1.0
+        project = compile_projector(MARKET_FIELDS)
+        assert list(project(entry)) == list(MARKET_FIELDS)
+        assert project(entry) == {field: entry[field] for field in MARKET_FIELDS}
+        assert project({}) == dict.fromkeys(MARKET_FIELDS)
+
+    @pytest.mark.unit
+    def test_projected_sparkline_omitted_when_missing(self):
+        # Proyectar sparkline sin datos omite la clave, igual que la respuesta completa
+        project = compile_projector(("id", "sparkline"))
+        assert project({"id": "btc"}) == {"id": "btc"}
+        assert project({"id": "btc", "sparkline": (1.0, 2.0)}) == {
+            "id": "btc",
+            "sparkline": (1.0, 2.0),
+        }
+
+
+class TestSparklineData:
+    """Pruebas del campo opcional sparkline en /api/cryptos."""
+
+    @pytest.mark.unit
+    def test_sparkline_requested_upstream(self, client):
+        # La misma llamada a markets debe pedir el sparkline de 7 días
+        with responses.RequestsMock() as mocked:
+            mocked.add(
+                responses.GET,
+                COINGECKO_MARKETS_URL,
+                match=[matchers.query_param_matcher({"sparkline": "true"}, strict_match=False)],
+                json=_generate_market_payload(),
+                status=200,
+            )
+            response = client.get("/api/cryptos")
+
+        assert response.status_code == 200
+
+    @pytest.mark.unit
+    def test_sparkline_is_downsampled(self, client):
+        # El sparkline se reduce en el servidor a un número fijo de puntos
+        payload = _generate_market_payload()
+        raw_prices = [float(hour) for hour in range(HISTORY_DAYS * 24)]
+        for item in payload:
+            item["sparkline_in_7d"] = {"price": raw_prices}
+        with responses.RequestsMock() as mocked:
+            _register_market_response(mocked, payload)
+            response = client.get("/api/cryptos")
+
+        for entry in response.get_json()["data"]:
+            assert len(entry["sparkline"]) == SPARKLINE_POINTS
+            assert entry["sparkline"][0] == raw_prices[0]
+            assert entry["sparkline"][-1] == raw_prices[-1]
+            assert "sparkline_in_7d" not in entry
+        assert isinstance(cache["cryptos"]["data"][0]["sparkline"], tuple)
+
+    @pytest.mark.unit
+    def test_sparkline_omitted_when_missing(self, client):
+        # Sin datos de sparkline la entrada no incluye el campo
+        payload = _generate_market_payload()
+        payload[0]["sparkline_in_7d"] = {"price": []}
+        with responses.RequestsMock() as mocked:
+            _register_market_response(mocked, payload)
+            response = client.get("/api/cryptos")
+
+        assert all("sparkline" not in entry for entry in response.get_json()["data"])
+
+    @pytest.mark.unit
+    def test_downsample_keeps_short_series(self):
+        # Las series cortas se conservan completas
+        assert downsample_series([1.0, 2.0, 3.0]) == (1.0, 2.0, 3.0)
+
+
 class TestGetCryptoHistoryEndpoint:
     """Pruebas unitarias enfocadas en /api/crypto/<id>/history."""
 
@@ -272,3 +446,193 @@ class TestGetCryptoHistoryEndpoint:
         # Si no se envía un ID, Flask debería responder con 404 por ruta inválida
         response = client.get("/api/crypto//history")
         assert response.status_code == 404
+
+
+class TestGetCryptoOhlcEndpoint:
+    """Pruebas para /api/crypto/<id>/ohlc."""
+
+    coin_id = "bitcoin"
+
+    @staticmethod
+    def _hourly_payload(coin_id: str, hours: int = 48) -> Dict[str, Any]:
+        start = 1_700_000_000_000 - 1_700_000_000_000 % 86_400_000
+        prices = [
+            [start + minute * 15 * 60_000, float(100 + minute % 7)]
+            for minute in range(hours * 4)
+        ]
+        return {"id": coin_id, "prices": prices}
+
+    @pytest.mark.unit
+    def test_ohlc_buckets_by_interval(self, client):
+        # Cada vela agrupa los puntos de su intervalo en open/high/low/close
+        payload = self._hourly_payload(self.coin_id)
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, self.coin_id, payload)
+            response = client.get(f"/api/crypto/{self.coin_id}/ohlc?interval=4h")
+
+        body = response.get_json()
+        candles = body["data"]["candles"]
+        assert response.status_code == 200
+        assert body["data"]["interval"] == "4h"
+        assert len(candles) == 12
+        first_bucket = [price for _, price in payload["prices"][:16]]
+        assert candles[0][1:] == [
+            first_bucket[0],
+            max(first_bucket),
+            min(first_bucket),
+            first_bucket[-1],
+        ]
+
+    @pytest.mark.unit
+    def test_ohlc_default_interval(self, client):
+        # Sin parámetro se usa el intervalo de 1 hora
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, self.coin_id, self._hourly_payload(self.coin_id))
+            response = client.get(f"/api/crypto/{self.coin_id}/ohlc")
+
+        body = response.get_json()
+        assert body["data"]["interval"] == "1h"
+        assert len(body["data"]["candles"]) == 48
+
+    @pytest.mark.unit
+    def test_ohlc_invalid_interval(self, client):
+        # Un intervalo no soportado responde 400 sin consultar CoinGecko
+        response = client.get(f"/api/crypto/{self.coin_id}/ohlc?interval=3m")
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    @pytest.mark.unit
+    def test_ohlc_cache_fallback(self, client):
+        # Si CoinGecko falla se agregan los precios cacheados
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, self.coin_id, self._hourly_payload(self.coin_id))
+            client.get(f"/api/crypto/{self.coin_id}/history")
+
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, self.coin_id, {}, status=500)
+            response = client.get(f"/api/crypto/{self.coin_id}/ohlc?interval=1d")
+
+        body = response.get_json()
+        assert response.status_code == 200
+        assert body["source"] == "cache"
+        assert body["cached_at"] is not None
+        assert len(body["data"]["candles"]) == 2
+
+    @pytest.mark.unit
+    def test_ohlc_api_error_without_cache(self, client):
+        # Sin caché previa un fallo externo se propaga como 502
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, self.coin_id, {}, status=500)
+            response = client.get(f"/api/crypto/{self.coin_id}/ohlc")
+
+        assert response.status_code == 502
+        assert self.coin_id in response.get_json()["error"]
+
+
+class TestExportHistoryEndpoint:
+    """Pruebas para la exportación en streaming de /api/export/history."""
+
+    @pytest.mark.unit
+    def test_export_csv_streams_cached_history(self, client):
+        # Exporta en CSV las series de varias monedas
+        with responses.RequestsMock() as mocked:
+            for coin_id in ("bitcoin", "ethereum"):
+                _register_history_response(mocked, coin_id, _generate_history_payload(coin_id))
+            response = client.get("/api/export/history?coins=bitcoin,ethereum&format=csv")
+
+        lines = response.get_data(as_text=True).splitlines()
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        assert lines[0] == "id,timestamp,price"
+        assert len(lines) == 1 + 2 * HISTORY_DAYS
+        assert lines[1].startswith("bitcoin,")
+        assert lines[-1].startswith("ethereum,")
+
+    @pytest.mark.unit
+    def test_export_ndjson_reads_from_cache(self, client):
+        # Sin parámetro coins se exportan todas las series cacheadas sin llamar a la API
+        payload = _generate_history_payload("bitcoin")
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, "bitcoin", payload)
+            client.get("/api/crypto/bitcoin/history")
+
+        with responses.RequestsMock():
+            response = client.get("/api/export/history?format=ndjson")
+
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert response.mimetype == "application/x-ndjson"
+        assert rows == [
+            {"id": "bitcoin", "timestamp": timestamp, "price": price}
+            for timestamp, price in payload["prices"]
+        ]
+
+    @pytest.mark.unit
+    def test_export_filters_by_range(self, client):
+        # Los parámetros start/end limitan los puntos exportados
+        payload = _generate_history_payload("bitcoin")
+        newest = payload["prices"][0][0]
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, "bitcoin", payload)
+            response = client.get(f"/api/export/history?coins=bitcoin&start={newest}")
+
+        assert len(response.get_data(as_text=True).splitlines()) == 2
+
+    @pytest.mark.unit
+    def test_export_chunks_large_series(self, client):
+        # Las series grandes se emiten en varios fragmentos
+        prices = [[index, float(index)] for index in range(2500)]
+        cache["history"]["bitcoin"] = {
+            "data": {"id": "bitcoin", "prices": prices},
+            "timestamp": datetime.now(UTC),
+        }
+        response = client.get("/api/export/history?coins=bitcoin", buffered=False)
+
+        chunks = list(response.response)
+        assert len(chunks) == 3
+        assert sum(chunk.count(b"\n") for chunk in chunks) == 2501
+
+    @pytest.mark.unit
+    def test_export_deduplicates_coins(self, client):
+        # Las monedas repetidas se exportan y consultan una sola vez
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, "bitcoin", _generate_history_payload("bitcoin"))
+            response = client.get("/api/export/history?coins=bitcoin,bitcoin")
+            assert len(mocked.calls) == 1
+
+        assert len(response.get_data(as_text=True).splitlines()) == 1 + HISTORY_DAYS
+
+    @pytest.mark.unit
+    def test_export_rejects_too_many_coins(self, client):
+        # Se limita el número de monedas para no multiplicar llamadas a la API
+        coins = ",".join(f"coin-{index}" for index in range(EXPORT_MAX_COINS + 1))
+        with responses.RequestsMock():
+            response = client.get(f"/api/export/history?coins={coins}")
+
+        assert response.status_code == 400
+        assert str(EXPORT_MAX_COINS) in response.get_json()["error"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("query", ["start=yesterday", "end=1.5"])
+    def test_export_rejects_invalid_range(self, client, query):
+        # Un rango no numérico responde 400 en lugar de exportar todo
+        response = client.get(f"/api/export/history?{query}")
+
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    @pytest.mark.unit
+    def test_export_invalid_format(self, client):
+        # Un formato no soportado responde 400
+        response = client.get("/api/export/history?format=xml")
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    @pytest.mark.unit
+    def test_export_upstream_error(self, client):
+        # Si una serie no está cacheada y CoinGecko falla se responde 502
+        with responses.RequestsMock() as mocked:
+            _register_history_response(mocked, "bitcoin", {}, status=500)
+            response = client.get("/api/export/history?coins=bitcoin")
+
+        assert response.status_code == 502
+        assert "bitcoin" in response.get_json()["error"]
@@ -0,0 +1,146 @@
+"""
+//
+//  test_assets.py
+//  CryptoTracker
+//
+//  Created by Cascade on Dec 14, 2025.
+//  Copyright © 2025 CryptoTracker. All rights reserved.
+//
+"""
+
+import gzip
+import shutil
+
+import brotli
+import pytest
+import responses
+
+from app import (
+    FINGERPRINTED_ASSETS,
+    IMMUTABLE_CACHE_CONTROL,
+    VENDOR_ASSETS,
+    app as flask_app,
+    build_static_assets,
+    minify_asset,
+    vendor_asset,
+)
+
+CHART_ASSET = "vendor/chart.umd.min.js"
+
+
+@pytest.fixture()
+def dist_dir(tmp_path):
+    previous = flask_app.config["ASSET_DIST_DIR"]
+    flask_app.config["ASSET_DIST_DIR"] = str(tmp_path / "dist")
+    yield tmp_path / "dist"
+    flask_app.config["ASSET_DIST_DIR"] = previous
+
+
+@pytest.fixture()
+def source_dir(tmp_path):
+    source = tmp_path / "static"
+    for name in FINGERPRINTED_ASSETS:
+        (source / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(f"{flask_app.static_folder}/{name}", source / name)
+    return source
+
+
+@pytest.fixture()
+def built_assets(dist_dir, source_dir):
+    report = build_static_assets(source_dir=str(source_dir), download_vendor=False)
+    return {row["name"]: row for row in report}
+
+
+class TestAssetPipeline:
+    """Pruebas del pipeline de assets con huella y precomprimidos."""
+
+    @pytest.mark.unit
+    def test_build_writes_hashed_and_compressed_variants(self, built_assets, dist_dir):
+        # Cada asset genera versión con hash, .gz y .br
+        main_js = built_assets["js/main.js"]
+        content = (dist_dir / main_js["file"]).read_bytes()
+
+        assert main_js["file"].startswith("js/main.")
+        assert gzip.decompress((dist_dir / f"{main_js['file']}.gz").read_bytes()) == content
+        assert brotli.decompress((dist_dir / f"{main_js['file']}.br").read_bytes()) == content
+        assert main_js["br"] < main_js["minified"] <= main_js["original"]
+        assert (dist_dir / "manifest.json").exists()
+
+    @pytest.mark.unit
+    def test_home_uses_hashed_urls(self, client, built_assets):
+        # La plantilla resuelve los nombres con hash mediante el manifest
+        html = client.get("/").get_data(as_text=True)
+
+        assert f"/assets/{built_assets['css/style.css']['file']}" in html
+        assert f"/assets/{built_assets['js/main.js']['file']}" in html
+        assert "cdn.jsdelivr.net" in html
+
+    @pytest.mark.unit
+    def test_home_uses_vendored_chart_when_built(self, client, dist_dir, source_dir):
+        # Con Chart.js descargado en el origen se sirve desde /assets/ y no desde el CDN
+        (source_dir / CHART_ASSET).parent.mkdir(parents=True, exist_ok=True)
+        (source_dir / CHART_ASSET).write_text("window.Chart = function () {};\n")
+        report = build_static_assets(source_dir=str(source_dir), download_vendor=False)
+        chart = next(row for row in report if row["name"] == CHART_ASSET)
+
+        html = client.get("/").get_data(as_text=True)
+
+        assert f"/assets/{chart['file']}" in html
+        assert "cdn.jsdelivr.net" not in html
+
+    @pytest.mark.unit
+    def test_home_falls_back_without_manifest(self, client, dist_dir):
+        # Sin build previo se sirven los archivos estáticos originales
+        html = client.get("/").get_data(as_text=True)
+
+        assert "/static/css/style.css" in html
+        assert "/static/js/main.js" in html
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "accept_encoding, expected",
+        [
+            ("gzip, br", "br"),
+            ("gzip", "gzip"),
+            ("", None),
+            ("gzip, br;q=0", "gzip"),
+            ("br;q=0, gzip;q=0", None),
+        ],
+    )
+    def test_serve_precompressed_immutable(
+        self, client, built_assets, accept_encoding, expected
+    ):
+        # Se elige la variante precomprimida según Accept-Encoding
+        url = f"/assets/{built_assets['css/style.css']['file']}"
+        response = client.get(url, headers={"Accept-Encoding": accept_encoding})
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/css"
+        assert response.headers.get("Content-Encoding") == expected
+        assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["Vary"] == "Accept-Encoding"
+        response.close()
+
+    @pytest.mark.unit
+    def test_serve_unknown_asset(self, client, built_assets):
+        # Solo se sirven archivos listados en el manifest
+        assert client.get("/assets/manifest.json").status_code == 404
+
+    @pytest.mark.unit
+    def test_minify_css_and_js(self):
+        # La minificación elimina comentarios y espacios redundantes
+        css = "/* note */\n.a {\n  color: red;\n}\n"
+        js = "// header\nconst a = 1;\n\n  const b = 2;\n"
+
+        assert minify_asset("style.css", css) == ".a{color: red;}"
+        assert minify_asset("main.js", js) == "const a = 1;\nconst b = 2;\n"
+
+    @pytest.mark.unit
+    def test_vendor_asset_rejects_integrity_mismatch(self, tmp_path):
+        # Un archivo descargado que no coincide con el hash SRI se descarta
+        url, _ = VENDOR_ASSETS[CHART_ASSET]
+        with responses.RequestsMock() as mocked:
+            mocked.add(responses.GET, url, body="tampered", status=200)
+            assert not vendor_asset(CHART_ASSET, str(tmp_path))
+
+        assert not (tmp_path / CHART_ASSET).exists()
@@ -13,7 +13,13 @@ from typing import Any, Dict, List
 import pytest
 import responses
 
-from app import COINGECKO_MARKETS_URL, cache
+from app import (
+    COINGECKO_MARKETS_URL,
+    OHLC_INTERVALS,
+    aggregate_ohlc,
+    cache,
+    update_ohlc_rollup,
+)
 
 
 def _build_crypto_item(idx: int, price_seed: float = 0) -> Dict[str, Any]:
@@ -106,3 +112,59 @@ class TestCacheBehavior:
         assert response.status_code == 200
         assert cache["cryptos"]["data"] == updated_payload[:10]
         assert cache["cryptos"]["data"] != first_payload[:10]
+
+
+class TestOhlcRollupCache:
+    """Validaciones del caché incremental de velas OHLC."""
+
+    interval = "1h"
+    start = 1_700_000_000_000 - 1_700_000_000_000 % 3_600_000
+
+    def _series(self, first_minute: int, last_minute: int) -> List[List[float]]:
+        return [
+            [self.start + minute * 60_000, float(minute)]
+            for minute in range(first_minute, last_minute, 5)
+        ]
+
+    @pytest.mark.unit
+    def test_rollup_cached_per_coin_and_interval(self):
+        # Cada combinación moneda/intervalo tiene su propia entrada
+        update_ohlc_rollup("bitcoin", "1h", self._series(0, 180))
+        update_ohlc_rollup("bitcoin", "4h", self._series(0, 180))
+
+        assert set(cache["ohlc"]) == {("bitcoin", "1h"), ("bitcoin", "4h")}
+        assert len(cache["ohlc"][("bitcoin", "1h")]["candles"]) == 3
+
+    @pytest.mark.unit
+    def test_rollup_updates_only_trailing_bucket(self):
+        # Los nuevos puntos actualizan la última vela y conservan las anteriores
+        first = update_ohlc_rollup("bitcoin", self.interval, self._series(0, 150))
+        closed_candle = first["candles"][0]
+
+        updated = update_ohlc_rollup("bitcoin", self.interval, self._series(0, 250))
+        expected = aggregate_ohlc(self._series(0, 250), OHLC_INTERVALS[self.interval])
+
+        assert updated["candles"] == expected
+        assert updated["candles"][0] is closed_candle
+
+    @pytest.mark.unit
+    def test_rollup_drops_buckets_outside_window(self):
+        # Cuando la ventana avanza se descartan las velas más antiguas
+        update_ohlc_rollup("bitcoin", self.interval, self._series(0, 250))
+        updated = update_ohlc_rollup("bitcoin", self.interval, self._series(60, 320))
+
+        assert updated["candles"][0][0] == self.start + 3_600_000
+        assert updated["candles"] == aggregate_ohlc(
+            self._series(60, 320), OHLC_INTERVALS[self.interval]
+        )
+
+    @pytest.mark.unit
+    def test_rollup_recomputes_leading_bucket_when_window_slides(self):
+        # Si la ventana avanza dentro de una vela, se recalcula con los puntos restantes
+        update_ohlc_rollup("bitcoin", self.interval, self._series(0, 250))
+        updated = update_ohlc_rollup("bitcoin", self.interval, self._series(30, 320))
+
+        assert updated["candles"] == aggregate_ohlc(
+            self._series(30, 320), OHLC_INTERVALS[self.interval]
+        )
+        assert updated["candles"][0][1:] == [30.0, 55.0, 30.0, 55.0]
@@ -0,0 +1,213 @@
+"""
+//
+//  test_mock_modes.py
+//  CryptoTracker
+//
+//  Created by Cascade on Dec 14, 2025.
+//  Copyright © 2025 CryptoTracker. All rights reserved.
+//
+"""
+
+import gzip
+import json
+import time
+
+import pytest
+from requests import RequestException
+
+from app import (
+    HEDGE_MIN_SAMPLES,
+    FileProvider,
+    ReplayProvider,
+    SyntheticProvider,
+    generate_synthetic_history,
+    generate_synthetic_markets,
+    market_providers,
+    mock_mode,
+    providers_for_mode,
+    record_market_response,
+    set_market_providers,
+    set_mock_data,
+)
+
+MARKETS = [
+    {
+        "id": "bitcoin",
+        "symbol": "btc",
+        "name": "Bitcoin",
+        "current_price": 45000.0,
+        "price_change_percentage_24h": 2.5,
+        "market_cap": 880000000000,
+        "image": "https://cdn.example.com/btc.png",
+        "total_volume": 38000000000,
+    }
+]
+
+
+@pytest.fixture(autouse=True)
+def restore_mock_mode(app_instance, monkeypatch):
+    monkeypatch.delenv("MOCK_COINGECKO", raising=False)
+    original_mode = app_instance.config.get("USE_MOCK_DATA")
+    original_providers = list(market_providers)
+    yield
+    set_market_providers(original_providers)
+    set_mock_data(original_mode)
+
+
+class SlowFileProvider(FileProvider):
+    """Proveedor de archivo que tarda más que su p95 para forzar el hedging."""
+
+    name = "slow-file"
+    delay = 0.3
+
+    def fetch_markets(self, limit: int):
+        time.sleep(self.delay)
+        return super().fetch_markets(limit)
+
+
+class TestMockModeSelection:
+    """Selección del modo de datos simulados."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (True, "static"),
+            (False, None),
+            ("1", "static"),
+            ("0", None),
+            ("Synthetic", "synthetic"),
+            ("replay", "replay"),
+            ("record", "record"),
+        ],
+    )
+    def test_parses_flags_and_mode_names(self, value, expected):
+        # Los booleanos heredados siguen significando el mock estático
+        set_mock_data(value)
+        assert mock_mode() == expected
+
+    @pytest.mark.unit
+    def test_record_mode_uses_live_providers(self, monkeypatch):
+        # Grabar implica consultar el upstream real, no los datos simulados
+        monkeypatch.setenv("MOCK_COINGECKO", "record")
+        assert mock_mode() == "record"
+        assert providers_for_mode(mock_mode()) is market_providers
+
+
+class TestSyntheticGenerator:
+    """Generador sintético determinista."""
+
+    @pytest.mark.unit
+    def test_markets_are_deterministic_and_ordered(self):
+        # La misma semilla produce el mismo mercado, ordenado por capitalización
+        generate_synthetic_markets.cache_clear()
+        first = generate_synthetic_markets(2000, 7)
+        generate_synthetic_markets.cache_clear()
+        second = generate_synthetic_markets(2000, 7)
+
+        assert first == second
+        assert len(first) == 2000
+        caps = [entry["market_cap"] for entry in first]
+        assert caps == sorted(caps, reverse=True)
+        assert generate_synthetic_markets(2000, 8) != first
+
+    @pytest.mark.unit
+    def test_history_ends_at_current_price(self):
+        # La serie respeta longitud, resolución y termina en el precio actual
+        end_ms = 1_700_000_000_000
+        series = generate_synthetic_history(
+            "synthetic-1", 123.45, seed=1, points=500, resolution_seconds=300, end_ms=end_ms
+        )
+
+        assert len(series) == 500
+        assert series[-1][1] == pytest.approx(123.45)
+        assert {b[0] - a[0] for a, b in zip(series, series[1:])} == {300_000}
+        assert series[-1][0] % 300_000 == 0
+        assert series == generate_synthetic_history(
+            "synthetic-1", 123.45, seed=1, points=500, resolution_seconds=300, end_ms=end_ms
+        )
+
+    @pytest.mark.unit
+    def test_synthetic_mode_serves_endpoints(self, client):
+        # El modo sintético alimenta los endpoints con coherencia entre lista e historial
+        set_mock_data("synthetic")
+
+        cryptos = client.get("/api/cryptos").get_json()["data"]
+        coin = cryptos[0]
+        history = client.get(f"/api/crypto/{coin['id']}/history").get_json()["data"]
+
+        assert coin["id"].startswith("synthetic-")
+        assert history["prices"][-1][1] == pytest.approx(coin["current_price"])
+
+    @pytest.mark.unit
+    def test_unknown_synthetic_coin_fails(self):
+        # Una moneda fuera del universo sintético se trata como fallo del proveedor
+        with pytest.raises(RequestException):
+            SyntheticProvider(coins=10).fetch_history("bitcoin", 7)
+
+
+class TestRecordReplay:
+    """Grabación y reproducción de respuestas del upstream."""
+
+    @pytest.mark.unit
+    def test_record_then_replay_round_trip(self, client, tmp_path, monkeypatch):
+        # Lo grabado en modo record se reproduce igual en modo replay
+        snapshot = tmp_path / "snapshot.json"
+        snapshot.write_text(json.dumps({"markets": MARKETS, "history": {"bitcoin": [[1, 2.0]]}}))
+        recording = tmp_path / "recording.ndjson.gz"
+        monkeypatch.setenv("MARKET_RECORD_FILE", str(recording))
+        monkeypatch.setenv("MARKET_REPLAY_FILE", str(recording))
+        monkeypatch.setenv("MARKET_REPLAY_SPEED", "0")
+        set_market_providers([FileProvider(str(snapshot))])
+
+        set_mock_data("record")
+        recorded = client.get("/api/cryptos").get_json()["data"]
+        client.get("/api/crypto/bitcoin/history")
+        set_mock_data("replay")
+        replayed = client.get("/api/cryptos").get_json()["data"]
+        history = client.get("/api/crypto/bitcoin/history").get_json()["data"]
+
+        with gzip.open(recording, "rt", encoding="utf-8") as handle:
+            keys = [json.loads(line)["key"] for line in handle]
+        assert keys == ["fetch_markets", "fetch_history:bitcoin"]
+        assert replayed == recorded
+        assert history["prices"] == [[1, 2.0]]
+
+    @pytest.mark.unit
+    def test_record_keeps_only_winning_hedge(self, client, tmp_path, monkeypatch):
+        # Con hedging solo se graba la respuesta servida, no la del proveedor perdedor
+        snapshot = tmp_path / "snapshot.json"
+        snapshot.write_text(json.dumps({"markets": MARKETS}))
+        recording = tmp_path / "recording.ndjson.gz"
+        monkeypatch.setenv("MARKET_RECORD_FILE", str(recording))
+        slow = SlowFileProvider(str(snapshot))
+        for _ in range(HEDGE_MIN_SAMPLES):
+            slow.latency.record(0.05)
+        set_market_providers([slow, FileProvider(str(snapshot))])
+
+        set_mock_data("record")
+        assert client.get("/api/cryptos").status_code == 200
+        time.sleep(SlowFileProvider.delay + 0.1)
+
+        with gzip.open(recording, "rt", encoding="utf-8") as handle:
+            records = [json.loads(line) for line in handle]
+        assert [record["provider"] for record in records] == ["file"]
+
+    @pytest.mark.unit
+    def test_replay_honours_recorded_latency(self, tmp_path, monkeypatch):
+        # La reproducción respeta la latencia grabada, escalada por la velocidad
+        recording = tmp_path / "recording.ndjson.gz"
+        monkeypatch.setenv("MARKET_RECORD_FILE", str(recording))
+        record_market_response("fetch_markets", (10,), "coingecko", 0.2, MARKETS)
+
+        started = time.perf_counter()
+        ReplayProvider(str(recording), speed=2.0).fetch_markets(10)
+        elapsed = time.perf_counter() - started
+
+        assert 0.1 <= elapsed < 0.2
+
+    @pytest.mark.unit
+    def test_replay_without_recording_raises(self, tmp_path):
+        # Sin grabación para la clave solicitada se propaga RequestException
+        with pytest.raises(RequestException):
+            ReplayProvider(str(tmp_path / "missing.ndjson.gz"), speed=0).fetch_markets(10)
@@ -0,0 +1,221 @@
+"""
+//
+//  test_profiling.py
+//  CryptoTracker
+//
+//  Created by Cascade on Dec 14, 2025.
+//  Copyright © 2025 CryptoTracker. All rights reserved.
+//
+"""
+
+import json
+import time
+
+import pytest
+
+from app import (
+    HEDGE_MIN_SAMPLES,
+    PROFILE_HEADER,
+    FileProvider,
+    PhaseTimer,
+    market_providers,
+    request_phases,
+    request_profiles,
+    set_market_providers,
+    slow_requests,
+)
+
+MARKETS = [
+    {
+        "id": "bitcoin",
+        "symbol": "btc",
+        "name": "Bitcoin",
+        "current_price": 45000.0,
+        "price_change_percentage_24h": 2.5,
+        "market_cap": 880000000000,
+        "image": "https://cdn.example.com/btc.png",
+        "total_volume": 38000000000,
+    }
+]
+
+
+class SlowUpstreamProvider(FileProvider):
+    """Proveedor que simula una espera larga al upstream para forzar el hedging."""
+
+    name = "slow-upstream"
+    delay = 0.3
+
+    def fetch_markets(self, limit: int):
+        with PhaseTimer("upstream"):
+            time.sleep(self.delay)
+        return super().fetch_markets(limit)
+
+
+@pytest.fixture(autouse=True)
+def profiling_config(app_instance):
+    keys = (
+        "SLOW_REQUEST_THRESHOLD_MS",
+        "PROFILING_ENABLED",
+        "DEBUG_ENDPOINTS_ENABLED",
+        "USE_MOCK_DATA",
+    )
+    original = {key: app_instance.config.get(key) for key in keys}
+    original_providers = list(market_providers)
+    app_instance.config["USE_MOCK_DATA"] = False
+    app_instance.config["DEBUG_ENDPOINTS_ENABLED"] = True
+    slow_requests.clear()
+    request_profiles.clear()
+    yield app_instance.config
+    app_instance.config.update(original)
+    set_market_providers(original_providers)
+    slow_requests.clear()
+    request_profiles.clear()
+
+
+class TestPhaseTimer:
+    """Medición de fases dentro de una petición."""
+
+    @pytest.mark.unit
+    def test_accumulates_into_current_request(self):
+        # Las fases repetidas se suman en el desglose activo
+        token = request_phases.set({})
+        try:
+            with PhaseTimer("decode"):
+                pass
+            with PhaseTimer("decode"):
+                pass
+            assert set(request_phases.get()) == {"decode"}
+        finally:
+            request_phases.reset(token)
+
+    @pytest.mark.unit
+    def test_noop_outside_sampled_request(self):
+        # Sin desglose activo el bloque no se mide
+        token = request_phases.set(None)
+        try:
+            with PhaseTimer("decode"):
+                pass
+            assert request_phases.get() is None
+        finally:
+            request_phases.reset(token)
+
+
+class TestSlowRequestSampler:
+    """Muestreo de peticiones lentas en un buffer circular."""
+
+    @pytest.mark.unit
+    def test_records_phase_breakdown(self, client, profiling_config, mock_coingecko):
+        # Una petición sobre el umbral guarda espera, decodificación, saneado y serialización
+        profiling_config["SLOW_REQUEST_THRESHOLD_MS"] = 0
+
+        assert client.get("/api/cryptos?fields=id").status_code == 200
+        samples = client.get("/api/debug/slow-requests").get_json()["data"]
+
+        assert samples[0]["path"] == "/api/cryptos?fields=id"
+        assert samples[0]["status"] == 200
+        assert {"upstream", "decode", "sanitize", "serialize", "other"} <= set(
+            samples[0]["phases"]
+        )
+
+    @pytest.mark.unit
+    def test_only_winning_hedge_counts(self, client, profiling_config, tmp_path):
+        # La espera del proveedor perdedor no se suma al desglose de la petición
+        profiling_config["SLOW_REQUEST_THRESHOLD_MS"] = 0
+        snapshot = tmp_path / "snapshot.json"
+        snapshot.write_text(json.dumps({"markets": MARKETS}))
+        slow = SlowUpstreamProvider(str(snapshot))
+        for _ in range(HEDGE_MIN_SAMPLES):
+            slow.latency.record(0.05)
+        set_market_providers([slow, FileProvider(str(snapshot))])
+
+        assert client.get("/api/cryptos").status_code == 200
+        time.sleep(SlowUpstreamProvider.delay + 0.1)
+
+        phases = slow_requests[-1]["phases"]
+        assert "upstream" not in phases
+        assert "sanitize" in phases
+
+    @pytest.mark.unit
+    def test_fast_requests_are_not_recorded(self, client, profiling_config, mock_coingecko):
+        # Las peticiones bajo el umbral no ocupan el buffer
+        profiling_config["SLOW_REQUEST_THRESHOLD_MS"] = 60_000
+
+        client.get("/api/crypto/bitcoin/history")
+
+        assert len(slow_requests) == 0
+
+    @pytest.mark.unit
+    def test_negative_threshold_disables_sampling(self, client, profiling_config):
+        # Un umbral negativo desactiva el muestreo
+        profiling_config["SLOW_REQUEST_THRESHOLD_MS"] = -1
+
+        client.get("/api/providers")
+
+        assert len(slow_requests) == 0
+
+    @pytest.mark.unit
+    def test_buffer_is_bounded(self, client, profiling_config):
+        # El buffer descarta las muestras más antiguas
+        profiling_config["SLOW_REQUEST_THRESHOLD_MS"] = 0
+
+        for _ in range(slow_requests.maxlen + 5):
+            client.get("/api/providers")
+
+        assert len(slow_requests) == slow_requests.maxlen
+
+
+class TestRequestProfiling:
+    """Perfilado bajo demanda por cabecera."""
+
+    @pytest.mark.unit
+    def test_header_profiles_request_when_enabled(self, client, profiling_config, mock_coingecko):
+        # Con el perfilado activo la cabecera guarda un perfil consultable
+        profiling_config["PROFILING_ENABLED"] = True
+
+        response = client.get("/api/cryptos", headers={PROFILE_HEADER: "1"})
+        profile_id = response.headers["X-Profile-Id"]
+        summaries = client.get("/api/debug/profiles").get_json()["data"]
+        stats = client.get(f"/api/debug/profiles/{profile_id}")
+
+        assert summaries[0]["id"] == int(profile_id)
+        assert "stats" not in summaries[0]
+        assert stats.mimetype == "text/plain"
+        text = stats.get_data(as_text=True)
+        assert "fetch_top_cryptos" in text
+        # Las llamadas al proveedor se ejecutan en el hilo perfilado
+        assert "_get_json" in text
+        assert "sanitize_market_data" in text
+
+    @pytest.mark.unit
+    def test_header_ignored_when_disabled(self, client, profiling_config, mock_coingecko):
+        # Sin habilitarlo en la configuración la cabecera no tiene efecto
+        profiling_config["PROFILING_ENABLED"] = False
+
+        response = client.get("/api/cryptos", headers={PROFILE_HEADER: "1"})
+
+        assert "X-Profile-Id" not in response.headers
+        assert len(request_profiles) == 0
+
+    @pytest.mark.unit
+    def test_unknown_profile_returns_404(self, client, profiling_config):
+        # Un identificador inexistente devuelve 404
+        profiling_config["PROFILING_ENABLED"] = True
+        assert client.get("/api/debug/profiles/999").status_code == 404
+
+
+class TestDebugEndpointAccess:
+    """Los endpoints de depuración solo existen con su bandera activa."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        ("flag", "url"),
+        [
+            ("DEBUG_ENDPOINTS_ENABLED", "/api/debug/slow-requests"),
+            ("PROFILING_ENABLED", "/api/debug/profiles"),
+            ("PROFILING_ENABLED", "/api/debug/profiles/1"),
+        ],
+    )
+    def test_hidden_when_disabled(self, client, profiling_config, flag, url):
+        # Sin la bandera responden 404 como si no existieran
+        profiling_config[flag] = False
+        assert client.get(url).status_code == 404
@@ -0,0 +1,428 @@
+"""
+//
+//  test_providers.py
+//  CryptoTracker
+//
+//  Created by Cascade on Dec 14, 2025.
+//  Copyright © 2025 CryptoTracker. All rights reserved.
+//
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List
+
+import pytest
+import responses
+from requests import RequestException
+
+from app import (
+    HEDGE_DEFAULT_DELAY,
+    HEDGE_MIN_SAMPLES,
+    PROVIDER_MAX_IN_FLIGHT,
+    CoinCapProvider,
+    CoinGeckoProvider,
+    FileProvider,
+    LatencyStats,
+    build_providers,
+    hedged_fetch,
+    market_providers,
+    set_market_providers,
+)
+
+COINGECKO_MARKETS = [
+    {
+        "id": "bitcoin",
+        "symbol": "btc",
+        "name": "Bitcoin",
+        "current_price": 45000.0,
+        "price_change_percentage_24h": 2.5,
+        "market_cap": 880000000000,
+        "image": "https://cdn.example.com/btc.png",
+        "total_volume": 38000000000,
+    }
+]
+COINCAP_ASSETS = {
+    "data": [
+        {
+            "id": "bitcoin",
+            "symbol": "BTC",
+            "name": "Bitcoin",
+            "priceUsd": "45100.5",
+            "changePercent24Hr": "2.6",
+            "marketCapUsd": "881000000000",
+            "volumeUsd24Hr": "39000000000",
+        }
+    ]
+}
+
+
+class StubServer:
+    """Servidor HTTP local que responde JSON fijo con un retardo configurable."""
+
+    def __init__(self, body: Any, delay: float = 0.0, status: int = 200) -> None:
+        self.body = json.dumps(body).encode()
+        self.delay = delay
+        self.status = status
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                stub.hits += 1
+                time.sleep(stub.delay)
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture()
+def stub_servers() -> Iterator[List[StubServer]]:
+    servers: List[StubServer] = []
+    yield servers
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture(autouse=True)
+def restore_providers():
+    original = list(market_providers)
+    yield
+    set_market_providers(original)
+
+
+def _warm_up(provider, seconds: float) -> None:
+    for _ in range(HEDGE_MIN_SAMPLES):
+        provider.latency.record(seconds)
+
+
+class TestLatencyStats:
+    """Estadísticas de latencia por proveedor."""
+
+    @pytest.mark.unit
+    def test_default_delay_until_enough_samples(self):
+        # Sin muestras suficientes se usa el retardo por defecto
+        stats = LatencyStats()
+        stats.record(0.2)
+        assert stats.hedge_delay(timeout=10) == HEDGE_DEFAULT_DELAY
+
+    @pytest.mark.unit
+    def test_delay_follows_p95(self):
+        # Con muestras suficientes el retardo es el p95 observado
+        stats = LatencyStats()
+        for index in range(100):
+            stats.record(index / 100)
+        assert stats.hedge_delay(timeout=10) == pytest.approx(0.95)
+        assert stats.hedge_delay(timeout=0.5) == 0.5
+
+
+class TestHedgedFetch:
+    """Peticiones con cobertura (hedging) y failover contra servidores locales."""
+
+    @pytest.mark.unit
+    def test_fast_primary_does_not_hedge(self, stub_servers):
+        # Si el primario responde a tiempo no se consulta al secundario
+        primary = StubServer(COINGECKO_MARKETS)
+        secondary = StubServer(COINCAP_ASSETS)
+        stub_servers.extend([primary, secondary])
+        set_market_providers(
+            [
+                CoinGeckoProvider(markets_url=primary.url),
+                CoinCapProvider(assets_url=secondary.url),
+            ]
+        )
+
+        data, provider = hedged_fetch("fetch_markets", 10)
+
+        assert provider == "coingecko"
+        assert data[0]["current_price"] == 45000.0
+        assert secondary.hits == 0
+
+    @pytest.mark.unit
+    def test_slow_primary_is_hedged_after_p95(self, stub_servers):
+        # Un primario más lento que su p95 dispara al secundario y gana el primero
+        primary = StubServer(COINGECKO_MARKETS, delay=1.0)
+        secondary = StubServer(COINCAP_ASSETS)
+        stub_servers.extend([primary, secondary])
+        coingecko = CoinGeckoProvider(markets_url=primary.url)
+        _warm_up(coingecko, 0.05)
+        set_market_providers([coingecko, CoinCapProvider(assets_url=secondary.url)])
+
+        started = time.perf_counter()
+        data, provider = hedged_fetch("fetch_markets", 10)
+        elapsed = time.perf_counter() - started
+
+        assert provider == "coincap"
+        assert elapsed < 0.8
+        assert data[0] == {
+            "id": "bitcoin",
+            "symbol": "btc",
+            "name": "Bitcoin",
+            "current_price": 45100.5,
+            "price_change_percentage_24h": 2.6,
+            "market_cap": 881000000000.0,
+            "image": "https://assets.coincap.io/assets/icons/btc@2x.png",
+            "total_volume": 39000000000.0,
+        }
+
+    @pytest.mark.unit
+    def test_failing_primary_fails_over_immediately(self, stub_servers):
+        # Un error del primario pasa al secundario sin esperar el retardo
+        primary = StubServer({"error": "down"}, status=500)
+        secondary = StubServer(COINCAP_ASSETS)
+        stub_servers.extend([primary, secondary])
+        coingecko = CoinGeckoProvider(markets_url=primary.url)
+        set_market_providers([coingecko, CoinCapProvider(assets_url=secondary.url)])
+
+        started = time.perf_counter()
+        _, provider = hedged_fetch("fetch_markets", 10)
+
+        assert provider == "coincap"
+        assert time.perf_counter() - started < HEDGE_DEFAULT_DELAY
+        assert coingecko.latency.errors == 1
+
+    @pytest.mark.unit
+    def test_invalid_response_is_not_accepted(self, stub_servers):
+        # Una respuesta vacía no cuenta como válida
+        primary = StubServer([])
+        secondary = StubServer(COINCAP_ASSETS)
+        stub_servers.extend([primary, secondary])
+        set_market_providers(
+            [
+                CoinGeckoProvider(markets_url=primary.url),
+                CoinCapProvider(assets_url=secondary.url),
+            ]
+        )
+
+        assert hedged_fetch("fetch_markets", 10)[1] == "coincap"
+
+    @pytest.mark.unit
+    def test_all_providers_failing_raises(self, stub_servers):
+        # Si todos fallan se propaga RequestException con los motivos
+        failing = StubServer({"error": "down"}, status=503)
+        stub_servers.append(failing)
+        set_market_providers(
+            [
+                CoinGeckoProvider(markets_url=failing.url),
+                CoinCapProvider(assets_url=failing.url),
+            ]
+        )
+
+        with pytest.raises(RequestException) as error:
+            hedged_fetch("fetch_markets", 10)
+        assert "coingecko" in str(error.value)
+        assert "coincap" in str(error.value)
+
+    @pytest.mark.unit
+    def test_saturated_provider_is_skipped(self, stub_servers):
+        # Un proveedor sin huecos libres no recibe más peticiones encoladas
+        primary = StubServer(COINGECKO_MARKETS)
+        secondary = StubServer(COINCAP_ASSETS)
+        stub_servers.extend([primary, secondary])
+        coingecko = CoinGeckoProvider(markets_url=primary.url)
+        set_market_providers([coingecko, CoinCapProvider(assets_url=secondary.url)])
+        for _ in range(PROVIDER_MAX_IN_FLIGHT):
+            coingecko.slots.acquire()
+        try:
+            _, provider = hedged_fetch("fetch_markets", 10)
+        finally:
+            for _ in range(PROVIDER_MAX_IN_FLIGHT):
+                coingecko.slots.release()
+
+        assert provider == "coincap"
+        assert primary.hits == 0
+
+    @pytest.mark.unit
+    def test_single_provider_waits_for_free_slot(self, client, stub_servers):
+        # Con un único proveedor las peticiones que exceden el límite esperan hueco en vez de fallar
+        server = StubServer({"prices": [[1700000000000, 45000.1]]}, delay=0.3)
+        stub_servers.append(server)
+        set_market_providers([CoinGeckoProvider(history_url=server.url + "{coin_id}")])
+        statuses: List[int] = []
+
+        def fetch(coin_id: str) -> None:
+            statuses.append(client.get(f"/api/crypto/{coin_id}/history").status_code)
+
+        threads = [
+            threading.Thread(target=fetch, args=(f"coin-{index}",))
+            for index in range(PROVIDER_MAX_IN_FLIGHT * 2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert statuses == [200] * len(threads)
+        assert server.hits == len(threads)
+
+    @pytest.mark.unit
+    def test_latency_measured_from_submission(self, tmp_path):
+        # La latencia incluye la espera desde que se encola la llamada
+        path = tmp_path / "snapshot.json"
+        path.write_text(json.dumps({"markets": COINGECKO_MARKETS}))
+        provider = FileProvider(str(path))
+
+        provider.call("fetch_markets", 10, submitted=time.perf_counter() - 0.5)
+
+        assert provider.latency.percentile(0.5) >= 0.5
+
+    @pytest.mark.unit
+    def test_malformed_primary_fails_over(self, client, stub_servers):
+        # Un payload mal formado (KeyError en el parser) pasa al siguiente proveedor
+        primary = StubServer({"data": [{"priceUsd": "1"}]})
+        secondary = StubServer({"prices": [[1700000000000, 45000.1]]})
+        stub_servers.extend([primary, secondary])
+        set_market_providers(
+            [
+                CoinCapProvider(history_url=primary.url + "{coin_id}"),
+                CoinGeckoProvider(history_url=secondary.url + "{coin_id}"),
+            ]
+        )
+
+        response = client.get("/api/crypto/bitcoin/history")
+
+        assert response.status_code == 200
+        assert response.get_json()["data"]["prices"] == [[1700000000000, 45000.1]]
+
+    @pytest.mark.unit
+    def test_history_endpoint_uses_secondary(self, client, stub_servers):
+        # El endpoint de historial usa el esquema normalizado del secundario
+        primary = StubServer({"error": "down"}, status=500)
+        secondary = StubServer({"data": [{"time": 1700000000000, "priceUsd": "45000.1"}]})
+        stub_servers.extend([primary, secondary])
+        set_market_providers(
+            [
+                CoinGeckoProvider(history_url=primary.url + "{coin_id}"),
+                CoinCapProvider(history_url=secondary.url + "{coin_id}"),
+            ]
+        )
+
+        response = client.get("/api/crypto/bitcoin/history")
+
+        assert response.status_code == 200
+        assert response.get_json()["data"]["prices"] == [[1700000000000, 45000.1]]
+
+
+class TestCoinCapIds:
+    """Normalización de identificadores de CoinCap al espacio de CoinGecko."""
+
+    assets_url = "https://coincap.test/assets"
+    history_url = "https://coincap.test/assets/{coin_id}/history"
+
+    @pytest.mark.unit
+    def test_markets_use_coingecko_ids(self):
+        # Los slugs distintos de CoinCap se traducen a los ids de CoinGecko
+        assets = {"data": [{**COINCAP_ASSETS["data"][0], "id": "xrp", "symbol": "XRP"}]}
+        with responses.RequestsMock() as mocked:
+            mocked.add(responses.GET, self.assets_url, json=assets)
+            markets = CoinCapProvider(assets_url=self.assets_url).fetch_markets(10)
+
+        assert markets[0]["id"] == "ripple"
+
+    @pytest.mark.unit
+    def test_history_requests_coincap_slug(self):
+        # El historial pide a CoinCap su propio slug para un id de CoinGecko
+        with responses.RequestsMock() as mocked:
+            mocked.add(
+                responses.GET,
+                self.history_url.format(coin_id="binance-coin"),
+                json={"data": [{"time": 1, "priceUsd": "300"}]},
+            )
+            prices = CoinCapProvider(history_url=self.history_url).fetch_history("binancecoin", 7)
+
+        assert prices == [[1, 300.0]]
+
+    @pytest.mark.unit
+    def test_failover_keeps_ids_and_sparkline(self, client):
+        # Al pasar al secundario se conservan los ids y el último sparkline conocido
+        primary_entry = {
+            **COINGECKO_MARKETS[0],
+            "id": "ripple",
+            "sparkline_in_7d": {"price": [1.0, 2.0, 3.0]},
+        }
+        assets = {"data": [{**COINCAP_ASSETS["data"][0], "id": "xrp", "symbol": "XRP"}]}
+        set_market_providers(
+            [
+                CoinGeckoProvider(markets_url="https://coingecko.test/markets"),
+                CoinCapProvider(assets_url=self.assets_url),
+            ]
+        )
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as mocked:
+            mocked.add(responses.GET, "https://coingecko.test/markets", json=[primary_entry])
+            first = client.get("/api/cryptos").get_json()["data"]
+        with responses.RequestsMock() as mocked:
+            mocked.add(responses.GET, "https://coingecko.test/markets", status=500)
+            mocked.add(responses.GET, self.assets_url, json=assets)
+            second = client.get("/api/cryptos").get_json()["data"]
+
+        assert [entry["id"] for entry in second] == [entry["id"] for entry in first]
+        assert second[0]["sparkline"] == first[0]["sparkline"]
+        assert second[0]["current_price"] == 45100.5
+
+    @pytest.mark.unit
+    def test_coincap_requires_api_key(self, monkeypatch):
+        # La API v3 de CoinCap exige clave: sin ella el proveedor no se registra
+        monkeypatch.delenv("COINCAP_API_KEY", raising=False)
+        assert [provider.name for provider in build_providers(["coingecko", "coincap"])] == [
+            "coingecko"
+        ]
+
+        monkeypatch.setenv("COINCAP_API_KEY", "secret")
+        coincap = build_providers(["coincap"])[0]
+        assert coincap.headers == {"Authorization": "Bearer secret"}
+
+
+class TestFileProvider:
+    """Proveedor local basado en archivo."""
+
+    @pytest.mark.unit
+    def test_reads_markets_and_history(self, tmp_path):
+        # Devuelve mercados sanitizados e historial grabado
+        snapshot: Dict[str, Any] = {
+            "markets": [{**COINGECKO_MARKETS[0], "extra": True}],
+            "history": {"bitcoin": [[1, 2.0]]},
+        }
+        path = tmp_path / "snapshot.json"
+        path.write_text(json.dumps(snapshot))
+        provider = FileProvider(str(path))
+
+        assert provider.call("fetch_markets", 10) == COINGECKO_MARKETS
+        assert provider.call("fetch_history", "bitcoin", 7) == [[1, 2.0]]
+        with pytest.raises(RequestException):
+            provider.fetch_history("ethereum", 7)
+
+    @pytest.mark.unit
+    def test_missing_file_raises_request_exception(self, tmp_path):
+        # Un archivo inexistente se trata como fallo del proveedor
+        with pytest.raises(RequestException):
+            FileProvider(str(tmp_path / "missing.json")).fetch_markets(10)
+
+    @pytest.mark.unit
+    def test_provider_stats_endpoint(self, client, tmp_path):
+        # /api/providers expone latencias y retardo de hedging
+        path = tmp_path / "snapshot.json"
+        path.write_text(json.dumps({"markets": COINGECKO_MARKETS}))
+        set_market_providers([FileProvider(str(path))])
+        client.get("/api/cryptos")
+
+        stats = client.get("/api/providers").get_json()["data"]
+        assert stats[0]["name"] == "file"
+        assert stats[0]["samples"] == 1
+        assert stats[0]["hedge_delay"] == HEDGE_DEFAULT_DELAY